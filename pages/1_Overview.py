@@ -1,32 +1,59 @@
 import streamlit as st
 
-from src import data, metrics, ui
+from src import cube, data, memo, metrics, money, timing, ui
 
 ui.apply_centered_layout()
 
 st.title("Overview")
 
-df, dq = data.load_dataset()
+with timing.stage("load dataset"):
+    df, dq = data.load_dataset()
 ui.show_mode_banner(dq)
 ui.render_refresh_button()
 
 filters = ui.render_global_filters(df)
-filtered_df = data.apply_filters(df, filters)
+# Everything derived below is shared across sessions per (dataset version, filter state).
+filtered_df = memo.memoize(
+    "filtered",
+    dq.version,
+    filters,
+    lambda: data.apply_filters(df, filters, index=data.load_filter_index(df, dq.version), version=dq.version),
+)
 
 if filtered_df is None or filtered_df.empty:
     st.warning("No data after applying filters. Try widening your selections.")
     st.stop()
 
-kpis = metrics.summary_kpis(filtered_df)
-# Compute biggest swing session
-swing = metrics.compute_biggest_swing_session(filtered_df)
-kpis["biggest_swing"] = swing
+
+def _standings():
+    # Full-range views roll up the precomputed cube instead of rescanning rows.
+    dataset_cube = data.load_cube(df, dq.version)
+    if cube.covers(dataset_cube, filters):
+        standings = cube.roll_up(dataset_cube, filters)
+    else:
+        standings = metrics.calculate_standings(filtered_df)
+    return metrics.add_streaks(standings, filtered_df)
+
+
+# Aggregate once; KPIs, the leaderboard and the bar chart all reuse it.
+standings = memo.memoize("standings", dq.version, filters, _standings)
+kpis = {
+    **memo.memoize("kpis", dq.version, filters, lambda: metrics.summary_kpis(filtered_df, standings=standings)),
+    "biggest_swing": memo.memoize(
+        "swing", dq.version, filters, lambda: metrics.compute_biggest_swing_session(filtered_df)
+    ),
+}
 ui.render_kpi_row(kpis)
 
 st.subheader("Standings")
-standings = metrics.calculate_standings(filtered_df)
 ui.render_standings_table(standings)
 
+with st.expander("Top 10 swings"):
+    swings = memo.memoize("top_swings", dq.version, filters, lambda: metrics.top_swings(filtered_df, k=10))
+    st.dataframe(money.for_display(swings), width="stretch", hide_index=True)
+
 st.subheader("Trends")
-ui.plot_cumulative_net(filtered_df)
+ui.plot_cumulative_net(
+    filtered_df, cumulative=memo.memoize("cumulative", dq.version, filters, lambda: metrics.cumulative_net(filtered_df))
+)
 ui.plot_total_net_bar(standings)
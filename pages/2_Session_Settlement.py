@@ -1,7 +1,8 @@
+import sqlite3
+
 import streamlit as st
-import pandas as pd
 
-from src import data, settlement, ui
+from src import data, ledger, memo, money, settlement, ui
 
 ui.apply_centered_layout()
 
@@ -16,39 +17,134 @@ if full_df is None or full_df.empty:
     st.warning("No data available. Add sessions first.")
     st.stop()
 
-# Build session selector label: date - session_id
-full_df = full_df.sort_values("date")
-session_options = (
-    full_df.groupby(["session_id", "date"], dropna=False)
-    .size()
-    .reset_index()[["session_id", "date"]]
+fewest = st.toggle(
+    "Fewest transfers",
+    value=True,
+    help="Search for the plan with the fewest payments. Large tables fall back to the quick greedy plan.",
 )
-session_options["label"] = session_options.apply(
-    lambda r: f"{r['date'].date()} - {r['session_id']}", axis=1
+mode = "optimal" if fewest else "greedy"
+# Every session is settled in one pass and shared per dataset version; picking a session is a lookup.
+by_session = memo.memoize(
+    "settle_sessions", dq.version, None, lambda: settlement.settle_sessions(full_df, mode=mode), mode
 )
 
-selected_label = st.selectbox(
+with st.expander("Ledger: who still owes whom"):
+    try:
+        # Hashing every session's nets is done once per dataset version; reading the ledger never creates it.
+        fingerprints = memo.memoize(
+            "session_fingerprints", dq.version, None, lambda: ledger.session_fingerprints(by_session)
+        )
+        pending = ledger.pending_sessions(by_session, fingerprints=fingerprints)
+        if pending:
+            st.caption(f"{len(pending)} settled session(s) are new or changed since they were added to the ledger.")
+            paid_through = st.date_input(
+                "Already paid up to",
+                value=None,
+                help="Sessions on or before this date are marked as settled without adding debts, "
+                "e.g. history from before the ledger was used.",
+            )
+            add_col, settle_col = st.columns(2)
+            if add_col.button("Add to ledger"):
+                ledger.record_sessions(by_session, fingerprints=fingerprints)
+                st.rerun()
+            if paid_through is not None and settle_col.button("Mark as settled"):
+                table = data.load_session_index(full_df, dq.version).sessions
+                dates = dict(zip(table["session_id"].astype(str), table["date"].dt.date))
+                history = [sid for sid in pending if dates.get(sid, paid_through) <= paid_through]
+                ledger.mark_settled(by_session, history, fingerprints=fingerprints)
+                st.rerun()
+        debts = ledger.outstanding()
+        if debts.empty:
+            st.info("Nothing outstanding.")
+        else:
+            st.dataframe(money.for_display(debts), width="stretch", hide_index=True)
+            # Outside the form so the amount below defaults to the balance of the pair just picked.
+            pair = st.selectbox(
+                "Payment",
+                options=debts.index,
+                format_func=lambda i: f"{debts.at[i, 'payer']} -> {debts.at[i, 'payee']}",
+            )
+            owed = float(money.to_pounds(debts.at[pair, "amount"]))
+            with st.form("record_payment"):
+                amount = st.number_input("Amount (£)", min_value=0.01, max_value=owed, value=owed, step=1.0)
+                if st.form_submit_button("Record payment"):
+                    pence = int(money.to_pence([amount])[0])
+                    try:
+                        ledger.record_payment(debts.at[pair, "payer"], debts.at[pair, "payee"], pence)
+                    except ValueError as exc:
+                        st.error(str(exc))
+                    else:
+                        st.rerun()
+    except (sqlite3.Error, OSError) as exc:
+        st.warning(f"Ledger unavailable: {exc}")
+
+scope = st.radio("Settle", ["One session", "Whole period"], horizontal=True)
+if scope == "Whole period":
+    index = data.load_filter_index(full_df, dq.version)
+    min_date, max_date = full_df["date"].min().date(), full_df["date"].max().date()
+    date_range = st.date_input("Date range", value=(min_date, max_date), min_value=min_date, max_value=max_date)
+    filters = {"date_range": date_range}
+    for col in ["group", "season"]:
+        options = sorted(full_df[col].dropna().unique()) if col in full_df.columns else []
+        if options:
+            filters[col] = st.multiselect("Group" if col == "group" else "Season", options=options)
+    period_df = memo.memoize(
+        "filtered", dq.version, filters, lambda: data.apply_filters(full_df, filters, index=index, version=dq.version)
+    )
+    if period_df.empty:
+        st.warning("No sessions in this period.")
+        st.stop()
+    period = memo.memoize(
+        "settle_period", dq.version, filters, lambda: settlement.settle_period(period_df, mode=mode), mode
+    )
+    for session_id, imbalance in period.imbalanced.items():
+        st.warning(
+            f"Session {session_id} does not balance (imbalance {money.format_pounds(imbalance)}) and is left out."
+        )
+
+    session_ids = period_df["session_id"].unique()
+    per_session = by_session.transfers[by_session.transfers["session_id"].isin(session_ids)]
+    st.subheader("Transfers")
+    st.caption(
+        f"Netting {len(session_ids) - len(period.imbalanced)} session(s): {len(period.transfers)} transfer(s) "
+        f"instead of {len(per_session)} settling each session separately."
+    )
+    if period.transfers.empty:
+        st.info("No transfers needed.")
+    else:
+        st.code(settlement.format_transfers_text(period.transfers.to_dict("records")))
+        st.dataframe(money.for_display(period.transfers), width="stretch")
+    with st.expander("Session-by-session transfers"):
+        st.dataframe(money.for_display(per_session), width="stretch", hide_index=True)
+    st.subheader("Net over the period")
+    st.dataframe(money.to_pounds(period.nets.sort_values(ascending=False).rename("net")), width="stretch")
+    st.stop()
+
+# Session table and per-session row offsets, built once per dataset version.
+sessions = data.load_session_index(full_df, dq.version)
+labels = sessions.sessions["label"].tolist()
+choice = st.selectbox(
     "Select session",
-    options=session_options["label"],
-    index=len(session_options) - 1 if not session_options.empty else 0,
+    options=range(len(labels)),
+    index=len(labels) - 1,
+    format_func=labels.__getitem__,
 )
-selected_session = session_options.loc[session_options["label"] == selected_label, "session_id"].iloc[0]
+session_info = sessions.sessions.iloc[choice]
+selected_session = session_info["session_id"]
+st.caption(f"{session_info['players']} player(s) · pot {money.format_pounds(session_info['pot'])}")
 
-session_df = full_df[full_df["session_id"] == selected_session].copy()
+session_df = data.session_rows(full_df, sessions, selected_session, dq.version)
 if session_df.empty:
     st.warning("No rows found for this session.")
     st.stop()
 
-# Build net mapping
-net_by_player = session_df.groupby("player")["net"].sum().to_dict()
-
-# Validate sum near zero
-imbalance = round(sum(net_by_player.values()), 6)
-if abs(imbalance) > 1e-4:
-    st.error(f"Net amounts do not balance to zero. Imbalance: {imbalance:.4f}. Check the session data.")
+if session_info["imbalance"]:
+    imbalance = money.format_pounds(session_info["imbalance"])
+    st.error(f"Net amounts do not balance to zero. Imbalance: {imbalance}. Check the session data.")
     st.stop()
 
-transfers = settlement.compute_settlement(net_by_player, tol=1e-6)
+session_transfers = settlement.session_transfers(by_session, selected_session)
+transfers = session_transfers[settlement.TRANSFER_COLUMNS].to_dict("records")
 
 st.subheader("Transfers")
 if not transfers:
@@ -68,11 +164,10 @@ else:
             """,
             height=0,
         )
-    transfers_df = pd.DataFrame(transfers, columns=["payer", "payee", "amount"])
-    st.dataframe(transfers_df, width="stretch")
+    st.dataframe(money.for_display(session_transfers[settlement.TRANSFER_COLUMNS]), width="stretch", hide_index=True)
 
 # Per-player table
 cols_to_show = [col for col in ["player", "buy_in", "cash_out", "net", "group", "venue"] if col in session_df.columns]
 per_player = session_df[cols_to_show].sort_values("net", ascending=False)
 st.subheader("Per-player results")
-st.dataframe(per_player, width="stretch")
+st.dataframe(money.for_display(per_player), width="stretch")
@@ -1,6 +1,6 @@
 import streamlit as st
 
-from src import data, metrics, ui
+from src import data, memo, metrics, money, ui
 
 ui.apply_centered_layout()
 
@@ -11,7 +11,12 @@ ui.show_mode_banner(dq)
 ui.render_refresh_button()
 
 filters = ui.render_global_filters(df)
-filtered_df = data.apply_filters(df, filters)
+filtered_df = memo.memoize(
+    "filtered",
+    dq.version,
+    filters,
+    lambda: data.apply_filters(df, filters, index=data.load_filter_index(df, dq.version), version=dq.version),
+)
 
 if filtered_df is None or filtered_df.empty:
     st.warning("No data after filters. Select more players or dates.")
@@ -20,16 +25,18 @@ if filtered_df is None or filtered_df.empty:
 players = sorted(filtered_df["player"].unique())
 selected_player = st.selectbox("Player", players)
 
-player_profile = metrics.player_profile(filtered_df, selected_player)
+player_profile = memo.memoize(
+    "player_profile", dq.version, filters, lambda: metrics.player_profile(filtered_df, selected_player), selected_player
+)
 
 ui.render_metric_cards(
     [
         {"label": "Games played", "value": player_profile["games_played"]},
         {"label": "Win rate", "value": f"{player_profile['win_rate']*100:.1f}%"},
-        {"label": "Avg net", "value": f"{player_profile['avg_net']:.2f}"},
-        {"label": "Median net", "value": f"{player_profile['median_net']:.2f}"},
-        {"label": "Best session", "value": f"{player_profile['best_session_net']:.2f}"},
-        {"label": "Worst session", "value": f"{player_profile['worst_session_net']:.2f}"},
+        {"label": "Avg net", "value": money.format_pounds(player_profile["avg_net"])},
+        {"label": "Median net", "value": money.format_pounds(player_profile["median_net"])},
+        {"label": "Best session", "value": money.format_pounds(player_profile["best_session_net"])},
+        {"label": "Worst session", "value": money.format_pounds(player_profile["worst_session_net"])},
     ]
 )
 
@@ -42,7 +49,8 @@ ui.plot_player_cumulative(player_df, selected_player)
 ui.plot_player_sessions(player_df, selected_player)
 
 st.subheader("Recent sessions")
+recent = money.for_display(data.attach_notes(player_profile["recent"]))
 try:
-    st.dataframe(player_profile["recent"], width="stretch")
+    st.dataframe(recent, width="stretch")
 except TypeError:
-    st.dataframe(player_profile["recent"], width="stretch")
+    st.dataframe(recent, width="stretch")
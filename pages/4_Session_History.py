@@ -1,6 +1,6 @@
 import streamlit as st
 
-from src import data, ui
+from src import data, memo, money, ui
 
 ui.apply_centered_layout()
 
@@ -11,12 +11,21 @@ ui.show_mode_banner(dq)
 ui.render_refresh_button()
 
 filters = ui.render_global_filters(df)
-filtered_df = data.apply_filters(df, filters)
+filtered_df = memo.memoize(
+    "filtered",
+    dq.version,
+    filters,
+    lambda: data.apply_filters(df, filters, index=data.load_filter_index(df, dq.version), version=dq.version),
+)
 
 if filtered_df is None or filtered_df.empty:
     st.warning("No data after filters. Try expanding your date range or players.")
     st.stop()
 
+# Notes are kept out of the cached frame in compact mode; join them only for display.
+# Money is stored in pence and shown (and downloaded) in pounds.
+filtered_df = money.for_display(data.attach_notes(filtered_df))
+
 st.download_button(
     "Download filtered CSV",
     data=filtered_df.to_csv(index=False).encode("utf-8"),
@@ -15,7 +15,8 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-raw_df = banned.load_banned_players()
+# The sheet tab is curated by hand; players the settlement ledger shows as still owing are added automatically.
+raw_df = banned.with_ledger_debtors(banned.load_banned_players(), banned.load_ledger_debtors())
 clean_df, warnings = banned.validate_banned_players_df(raw_df)
 
 if warnings:
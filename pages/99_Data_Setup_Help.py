@@ -1,7 +1,7 @@
 import pandas as pd
 import streamlit as st
 
-from src import config, data, sheets, ui
+from src import config, data, memo, money, sheets, timing, ui
 
 ui.apply_centered_layout()
 
@@ -66,15 +66,47 @@ col_b.write(f"Detected headers: {status.get('headers', [])}")
 if status.get("error"):
     st.error(f"Connection error: {status['error']}")
 
+st.subheader("Load statistics")
+load_stats = data.load_stats()
+fetch_stats = sheets.fetch_stats()
+col_a, col_b = st.columns(2)
+col_a.write(
+    f"Sessions dataset: {load_stats['hits']} cache hits, {load_stats['waits']} coalesced waits, "
+    f"{load_stats['fetches']} fetches ({load_stats['errors']} failed)"
+)
+col_b.write(f"Other tabs: {fetch_stats['waits']} coalesced waits, {fetch_stats['fetches']} fetches")
+memo_stats = memo.stats()
+st.write(
+    f"Derived results cache: {memo_stats['entries']} entries, {memo_stats['bytes'] / 1e6:.1f} MB, "
+    f"{memo_stats['hits']} hits, {memo_stats['misses']} misses, {memo_stats['evictions']} evictions."
+)
+resilience = sheets.resilience_diagnostics()
+st.write(
+    f"Sheets circuit breaker: {resilience['state']} ({resilience['consecutive_failures']} consecutive failures"
+    + (f", next attempt in {resilience['retry_in_seconds']}s" if resilience["state"] == "open" else "")
+    + f"). Calls: {resilience['calls']}, retries: {resilience['retries']}, "
+    f"failed after retries: {resilience['failures']}, rejected while open: {resilience['rejected']}."
+)
+
+if timing.STAGES:
+    st.write("Startup stages (cold start / latest run):")
+    st.table(
+        {
+            name: f"{timing.COLD_START.get(name, seconds) * 1000:.0f} ms / {seconds * 1000:.0f} ms"
+            for name, seconds in timing.STAGES.items()
+        }
+    )
+
 st.subheader("Current data preview")
 df, dq = data.load_dataset()
 if df.empty:
     st.warning("No data available yet. Add rows to your Google Sheet or use the template above.")
 else:
+    preview = money.for_display(data.attach_notes(df.head(10)))
     try:
-        st.dataframe(df.head(10), width="stretch")
+        st.dataframe(preview, width="stretch")
     except TypeError:
-        st.dataframe(df.head(10), width="stretch")
+        st.dataframe(preview, width="stretch")
 
 st.subheader("Secrets format (example)")
 st.code(
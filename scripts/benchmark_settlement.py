@@ -0,0 +1,49 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import settlement  # noqa: E402
+
+
+def random_table(players: int, rng: random.Random) -> dict:
+    """Nets in pence, in 50p steps like a real buy-in/cash-out night, summing to zero."""
+    nets = [rng.randint(-400, 400) * 50 for _ in range(players - 1)]
+    nets.append(-sum(nets))
+    return {f"P{i:02d}": n for i, n in enumerate(nets)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time greedy vs fewest-transfers settlement on random tables")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 15, 20, 25, 30, 40, 50, 60])
+    parser.add_argument("--runs", type=int, default=20, help="Random tables per size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'players':>7} {'greedy ms':>10} {'optimal ms':>11} {'p95 ms':>8} {'saved':>6} {'solved':>7}")
+    for size in args.sizes:
+        greedy_ms, optimal_ms, saved, solved = [], [], 0, 0
+        for _ in range(args.runs):
+            nets = random_table(size, rng)
+            start = time.perf_counter()
+            greedy = settlement.compute_settlement(nets)
+            greedy_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            transfers, optimal = settlement.compute_optimal_settlement(nets)
+            optimal_ms.append((time.perf_counter() - start) * 1000)
+            saved += len(greedy) - len(transfers)
+            solved += optimal
+        p95 = sorted(optimal_ms)[int(0.95 * (len(optimal_ms) - 1))]
+        print(
+            f"{size:>7} {statistics.median(greedy_ms):>10.2f} {statistics.median(optimal_ms):>11.2f} "
+            f"{p95:>8.2f} {saved / args.runs:>6.2f} {solved:>3}/{args.runs:<3}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,59 @@
+import logging
+import sqlite3
 import pandas as pd
-import streamlit as st
 from pathlib import Path
 import re
 
-from . import sheets
+from . import ledger, sheets
+from .config import BANNED_WORKSHEET_NAME, LEDGER_PATH
+
+logger = logging.getLogger(__name__)
 
 
-@st.cache_data(ttl=60, show_spinner=False)
 def load_banned_players() -> pd.DataFrame:
     """
     Load banned players from the Google Sheet tab `banned_players`.
+    Usually served from the batched read made with the sessions tab; otherwise
+    from fetch_sheet's cache, so there is no separate timer to go stale on.
     If sheets secrets are missing or tab not found, return empty DataFrame.
     """
     if not sheets.is_configured():
         return pd.DataFrame()
     try:
-        df, _ = sheets.fetch_sheet(worksheet_name="banned_players")
+        df, _ = sheets.fetch_companion(BANNED_WORKSHEET_NAME)
         return pd.DataFrame(df)
     except Exception:
         return pd.DataFrame()
 
 
+def load_ledger_debtors() -> pd.DataFrame:
+    """
+    Players the settlement ledger says still owe money, shaped like the banned_players tab.
+    Empty if there is no ledger (one is never created just to look) or it cannot be read.
+    """
+    if not LEDGER_PATH.exists():
+        return pd.DataFrame()
+    try:
+        return ledger.unpaid_debtors()
+    except (sqlite3.Error, OSError):
+        logger.exception("Could not read ledger debtors from %s", LEDGER_PATH)
+        return pd.DataFrame()
+
+
+def with_ledger_debtors(df: pd.DataFrame, debtors: pd.DataFrame) -> pd.DataFrame:
+    """Append ledger debtors who are not already listed; a row in the sheet always wins."""
+    if debtors is None or debtors.empty:
+        return df
+    if df is None or df.empty:
+        return debtors
+    working = df.rename(columns=lambda c: str(c).strip().lower())
+    if "player_name" not in working.columns:
+        return df
+    listed = set(working["player_name"].astype(str).str.strip().str.lower())
+    extra = debtors[~debtors["player_name"].str.lower().isin(listed)]
+    return pd.concat([working, extra], ignore_index=True)
+
+
 def validate_banned_players_df(df: pd.DataFrame):
     """
     Clean and validate banned players data.
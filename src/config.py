@@ -1,6 +1,10 @@
 from pathlib import Path
 
 CACHE_TTL_SECONDS = 60
+# Incremental syncs only append new rows; force a full re-read this often to pick up edits.
+FULL_RESYNC_SECONDS = 15 * 60
+# Between full re-reads, the buy_in/cash_out columns of synced rows are re-checked this often.
+MONEY_RECHECK_SECONDS = 5 * 60
 
 REQUIRED_COLUMNS = ["session_id", "date", "player", "buy_in", "cash_out"]
 OPTIONAL_COLUMNS = ["venue", "group", "season", "notes"]
@@ -10,7 +14,30 @@ NUMERIC_COLUMNS = ["buy_in", "cash_out"]
 DATE_FORMAT = "%Y-%m-%d"
 
 DEFAULT_WORKSHEET_NAME = "sessions"
+BANNED_WORKSHEET_NAME = "banned_players"
+# Small tabs fetched in the same batched request as the sessions tab.
+COMPANION_WORKSHEETS = (BANNED_WORKSHEET_NAME,)
 SHEETS_SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+# Transient Sheets errors (429/5xx, dropped connections) are retried with jittered backoff.
+SHEETS_RETRY_ATTEMPTS = 4
+SHEETS_BACKOFF_BASE_SECONDS = 0.5
+SHEETS_BACKOFF_CAP_SECONDS = 8.0
+# After this many failed calls in a row, stop calling Sheets for BREAKER_RESET_SECONDS.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_SECONDS = 60
+# Derived artifacts (standings, KPIs, chart data) shared across sessions, bounded both ways.
+MEMO_MAX_ENTRIES = 256
+MEMO_MAX_BYTES = 64 * 1024 * 1024
+# Pooled clients refresh their OAuth token when it is this close to expiring.
+TOKEN_REFRESH_MARGIN_SECONDS = 5 * 60
+# The fewest-transfers settlement search is exponential; above either budget it falls back to greedy.
+SETTLEMENT_MAX_PLAYERS = 20
+SETTLEMENT_TIME_BUDGET_SECONDS = 0.5
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 SAMPLE_CSV_PATH = ROOT_DIR / "data" / "sessions_sample.csv"
+SNAPSHOT_DIR = ROOT_DIR / ".cache" / "snapshots"
+# Transfers recorded as due or paid; kept out of .cache because it is not derivable from the sheet.
+LEDGER_PATH = ROOT_DIR / "data" / "ledger.sqlite3"
+# Ledger debtors are listed on the Banned page once they owe at least this much overall (pence).
+LEDGER_BAN_MIN_PENCE = 500
@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+
+CUBE_DIMENSIONS = ["group", "venue", "season"]
+
+
+@dataclass
+class AggregateCube:
+    """
+    Additive per-player aggregates over the optional filter dimensions.
+
+    One cell per (player, group, venue, season) holds counts, sums, wins,
+    losses, max and min, so standings for any player/dimension filter can be
+    rolled up from cells instead of rescanning session rows.
+    """
+
+    dimensions: List[str] = field(default_factory=list)
+    cells: pd.DataFrame = field(default_factory=pd.DataFrame)
+    date_min: pd.Timestamp | None = None
+    date_max: pd.Timestamp | None = None
+
+
+def build_cube(df: pd.DataFrame) -> AggregateCube:
+    """Aggregate a normalized dataset into cube cells."""
+    if df is None or df.empty:
+        return AggregateCube()
+
+    dims = [col for col in CUBE_DIMENSIONS if col in df.columns]
+    net = df["net"]
+    working = df[["player", "session_id", *dims]].assign(net=net, win=net > 0, loss=net < 0)
+    cells = (
+        working.groupby(["player", *dims], dropna=False, observed=True)
+        .agg(
+            games_played=("session_id", "count"),
+            total_net=("net", "sum"),
+            net_count=("net", "count"),
+            best_session_net=("net", "max"),
+            worst_session_net=("net", "min"),
+            wins=("win", "sum"),
+            losses=("loss", "sum"),
+        )
+        .reset_index()
+    )
+    return AggregateCube(dimensions=dims, cells=cells, date_min=df["date"].min(), date_max=df["date"].max())
+
+
+def covers(cube: AggregateCube, filters: Dict[str, List]) -> bool:
+    """
+    True when the cube can answer `filters` exactly.
+
+    Cells carry no date dimension, so only date ranges spanning the whole
+    dataset (the sidebar default) can be rolled up.
+    """
+    if cube.cells.empty:
+        return False
+    date_range = (filters or {}).get("date_range")
+    if not date_range or not isinstance(date_range, (list, tuple)):
+        return True
+    start = date_range[0]
+    end = date_range[1] if len(date_range) > 1 else None
+    if start and start > cube.date_min.date():
+        return False
+    if end and end < cube.date_max.date():
+        return False
+    return True
+
+
+def roll_up(cube: AggregateCube, filters: Dict[str, List]) -> pd.DataFrame:
+    """Standings for the player/dimension filters, matching metrics.calculate_standings."""
+    cells = cube.cells
+    if cells.empty:
+        return pd.DataFrame(columns=metrics.STANDINGS_COLUMNS)
+
+    filters = filters or {}
+    mask = np.ones(len(cells), dtype=bool)
+    players = filters.get("players") or []
+    if players:
+        mask &= cells["player"].isin(players).to_numpy()
+    for col in cube.dimensions:
+        vals = filters.get(col) or []
+        if vals:
+            mask &= cells[col].isin(vals).to_numpy()
+    selected = cells.loc[mask]
+    if selected.empty:
+        return pd.DataFrame(columns=metrics.STANDINGS_COLUMNS)
+
+    standings = (
+        selected.groupby("player", observed=True)
+        .agg(
+            games_played=("games_played", "sum"),
+            total_net=("total_net", "sum"),
+            net_count=("net_count", "sum"),
+            best_session_net=("best_session_net", "max"),
+            worst_session_net=("worst_session_net", "min"),
+            wins=("wins", "sum"),
+            losses=("losses", "sum"),
+        )
+        .reset_index()
+    )
+    standings["avg_net"] = standings["total_net"] / standings["net_count"].where(standings["net_count"] > 0)
+    standings["win_rate"] = metrics.win_rate_from_counts(standings["wins"], standings["losses"])
+    return standings[metrics.STANDINGS_COLUMNS].sort_values("total_net", ascending=False).reset_index(drop=True)
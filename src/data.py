@@ -1,13 +1,19 @@
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
-
-import gspread
+import logging
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import numpy as np
 import pandas as pd
 import streamlit as st
+from pandas.tseries.api import guess_datetime_format
 
-from . import sheets
+from . import cube, flight, io, money, sheets
 from .config import (
     CACHE_TTL_SECONDS,
+    COMPANION_WORKSHEETS,
     DATE_FORMAT,
     DEFAULT_WORKSHEET_NAME,
     NUMERIC_COLUMNS,
@@ -16,6 +22,11 @@ from .config import (
     SAMPLE_CSV_PATH,
 )
 
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    import gspread
+
 
 @dataclass
 class DataQuality:
@@ -23,6 +34,10 @@ class DataQuality:
     issues: List[str] = field(default_factory=list)
     warnings: Dict[str, int] = field(default_factory=dict)
     headers: List[str] = field(default_factory=list)
+    # Epoch seconds when the rows were read from their source.
+    loaded_at: float | None = None
+    # Identifies this exact dataset; derived caches key on it instead of hashing frames.
+    version: str = ""
 
 
 def clean_column_name(name: str) -> str:
@@ -30,8 +45,61 @@ def clean_column_name(name: str) -> str:
     return str(name).strip().lower().replace(" ", "_")
 
 
-def normalize_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, DataQuality]:
-    """Standardize columns, coerce types, drop bad rows, compute net."""
+_BLANK = re.compile(r"\s*")
+# Date format detected per header signature, so later loads and appended-row deltas skip inference.
+_DATE_FORMATS: Dict[Tuple[str, ...], str] = {}
+
+
+def _blank_to_na(series: pd.Series) -> pd.Series:
+    """Replace empty/whitespace-only strings with NA, checking each distinct value once."""
+    if not (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)):
+        return series
+    codes, uniques = pd.factorize(series)
+    # Slot -1 (already missing) stays False.
+    blank = np.zeros(len(uniques) + 1, dtype=bool)
+    blank[:-1] = [isinstance(v, str) and _BLANK.fullmatch(v) is not None for v in uniques]
+    mask = blank[codes]
+    return series.mask(mask, pd.NA) if mask.any() else series
+
+
+def _parse_dates(raw: pd.Series, signature: Tuple[str, ...]) -> pd.Series:
+    """
+    Parse dates UK-style (dayfirst), once per distinct value.
+
+    Matches pd.to_datetime(..., dayfirst=True, errors="coerce") on the column,
+    which infers one format from the first value; that format is cached per
+    header signature and reused while it still fits the first value.
+    """
+    codes, uniques = pd.factorize(raw)
+    values = pd.Index(uniques)
+    # If strings are present, clean NBSP and whitespace before parsing.
+    if raw.dtype == object or isinstance(raw.iloc[0], str):
+        values = values.astype(str).str.replace("\u00a0", " ", regex=False).str.strip()
+
+    fmt = None
+    first = values[0] if len(values) and isinstance(values[0], str) else None
+    if first is not None:
+        fmt = _DATE_FORMATS.get(signature)
+        if fmt is None or pd.isna(pd.to_datetime(first, format=fmt, errors="coerce")):
+            fmt = guess_datetime_format(first, dayfirst=True)
+            if fmt:
+                _DATE_FORMATS[signature] = fmt
+    if fmt:
+        parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+    else:
+        parsed = pd.to_datetime(values, errors="coerce", dayfirst=True)
+    parsed = pd.DatetimeIndex(parsed)
+    if not len(parsed):
+        return pd.Series(pd.NaT, index=raw.index, dtype=parsed.dtype)
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=raw.index)
+
+
+def normalize_dataframe(df: pd.DataFrame, compact: bool = False) -> Tuple[pd.DataFrame, DataQuality]:
+    """
+    Standardize columns, coerce types, drop bad rows, compute net.
+
+    With compact=True the result goes through compact_dataset.
+    """
     dq = DataQuality()
     if df is None or df.empty:
         dq.issues.append("No data found.")
@@ -40,7 +108,6 @@ def normalize_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, DataQuality]:
     working = df.copy()
     working.columns = [clean_column_name(c) for c in working.columns]
     dq.headers = list(working.columns)
-    working.replace(r"^\s*$", pd.NA, regex=True, inplace=True)
 
     missing = [col for col in REQUIRED_COLUMNS if col not in working.columns]
     if missing:
@@ -58,23 +125,16 @@ def normalize_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, DataQuality]:
         dq.issues.append("Missing required column 'group' (legacy 'game_type' is also accepted).")
         return pd.DataFrame(columns=REQUIRED_COLUMNS + OPTIONAL_COLUMNS + ["net"]), dq
 
+    # Blank cells -> NA, only on string columns we keep.
+    for col in keep_cols:
+        working[col] = _blank_to_na(working[col])
+
     # Normalize group values
     working["group"] = working["group"].fillna("Unknown").astype(str).str.strip()
     working.loc[working["group"] == "", "group"] = "Unknown"
 
     # Dates (UK-friendly parsing)
-    date_col = "date"
-    raw_dates = working[date_col]
-    cleaned_dates = raw_dates
-    # If strings are present, clean NBSP and whitespace before parsing.
-    if cleaned_dates.dtype == object or isinstance(cleaned_dates.iloc[0], str):
-        cleaned_dates = (
-            cleaned_dates.astype(str)
-            .str.replace("\u00a0", " ", regex=False)
-            .str.strip()
-        )
-    parsed_dates = pd.to_datetime(cleaned_dates, errors="coerce", dayfirst=True)
-    working["date"] = parsed_dates
+    working["date"] = _parse_dates(working["date"], tuple(dq.headers))
     invalid_dates = int(working["date"].isna().sum())
     if invalid_dates:
         dq.warnings["invalid_dates"] = invalid_dates
@@ -82,7 +142,8 @@ def normalize_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, DataQuality]:
 
     # Numbers
     for col in NUMERIC_COLUMNS:
-        working[col] = pd.to_numeric(working[col], errors="coerce")
+        # "inf"/"-inf" parse as numbers but are no amount of money: count them as invalid too.
+        working[col] = pd.to_numeric(working[col], errors="coerce").replace([np.inf, -np.inf], np.nan)
         invalid_numbers = int(working[col].isna().sum())
         if invalid_numbers:
             dq.warnings[f"invalid_{col}"] = invalid_numbers
@@ -96,6 +157,14 @@ def normalize_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, DataQuality]:
     working["session_id"] = working["session_id"].astype(str)
     working["player"] = working["player"].astype(str)
 
+    # Money as exact int64 pence from here on; sub-penny inputs are rounded.
+    sub_pence = 0
+    for col in NUMERIC_COLUMNS:
+        sub_pence += money.sub_pence_count(working[col])
+        working[col] = money.to_pence(working[col])
+    if sub_pence:
+        dq.warnings["rounded_to_pence"] = sub_pence
+
     # Derived net
     working["net"] = working["cash_out"] - working["buy_in"]
 
@@ -107,15 +176,192 @@ def normalize_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, DataQuality]:
         working = working.loc[~dupe_mask]
 
     working = working.sort_values(by="date").reset_index(drop=True)
-    return working, dq
+    return (compact_dataset(working) if compact else working), dq
 
 
-def load_dataset(
-    gc: gspread.client.Client | None = None,
+def merge_normalized(
+    base: pd.DataFrame, base_dq: DataQuality, delta: pd.DataFrame
+) -> Tuple[pd.DataFrame, DataQuality]:
+    """Normalize appended raw rows and merge them into an already-normalized frame."""
+    dq = DataQuality(
+        source=base_dq.source,
+        issues=list(base_dq.issues),
+        warnings=dict(base_dq.warnings),
+        headers=list(base_dq.headers),
+    )
+    if delta is None or delta.empty:
+        return base, dq
+
+    delta_norm, delta_dq = normalize_dataframe(delta)
+    dq.issues.extend(issue for issue in delta_dq.issues if issue not in dq.issues)
+    for key, count in delta_dq.warnings.items():
+        dq.warnings[key] = dq.warnings.get(key, 0) + count
+    if delta_norm.empty:
+        return base, dq
+
+    merged = pd.concat([base, delta_norm], ignore_index=True)
+    # Appended rows win over earlier rows for the same (session_id, player).
+    dupe_mask = merged.duplicated(subset=["session_id", "player"], keep="last")
+    dupe_count = int(dupe_mask.sum())
+    if dupe_count:
+        dq.warnings["duplicate_session_player"] = dq.warnings.get("duplicate_session_player", 0) + dupe_count
+        merged = merged.loc[~dupe_mask]
+
+    merged = merged.sort_values(by="date", kind="stable").reset_index(drop=True)
+    return merged, dq
+
+
+CATEGORICAL_COLUMNS = ["session_id", "player", "group", "venue", "season"]
+MONEY_COLUMNS = ["buy_in", "cash_out", "net"]
+
+
+def _downcast_money(series: pd.Series) -> pd.Series:
+    """Shrink a pence column to int32 when every value fits."""
+    if series.empty or not pd.api.types.is_integer_dtype(series.dtype):
+        return series
+    bounds = np.iinfo(np.int32)
+    if bounds.min <= series.min() and series.max() <= bounds.max:
+        return series.astype(np.int32)
+    return series
+
+
+def compact_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """Store repeated dimensions as categoricals and pence in 32-bit ints where they fit."""
+    if df is None or df.empty:
+        return df
+    compact = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in compact.columns:
+            compact[col] = compact[col].astype("category")
+    for col in MONEY_COLUMNS:
+        if col in compact.columns:
+            compact[col] = _downcast_money(compact[col])
+    return compact
+
+
+# Notes split off compact datasets, keyed like snapshots; pages attach them on demand.
+_NOTES: Dict[str, pd.DataFrame] = {}
+_NOTES_LOCK = threading.Lock()
+
+
+def _split_notes(key: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Move the free-text notes column out of the cached frame into the notes store."""
+    if df is None or "notes" not in df.columns:
+        return df
+    notes = df.loc[df["notes"].notna(), ["session_id", "player", "notes"]]
+    notes = notes.astype({"session_id": str, "player": str}).reset_index(drop=True)
+    with _NOTES_LOCK:
+        _NOTES[key] = notes
+    return df.drop(columns=["notes"])
+
+
+def attach_notes(df: pd.DataFrame) -> pd.DataFrame:
+    """Join notes back onto rows about to be displayed (no-op unless compact mode split them off)."""
+    if df is None or df.empty or "notes" in df.columns:
+        return df
+    load_args = _resolve_load_args()
+    with _NOTES_LOCK:
+        notes = _NOTES.get(_snapshot_key(load_args[1], load_args[2]))
+    if notes is None:
+        return df
+    keys = df[["session_id", "player"]].astype(str)
+    joined = keys.merge(notes, on=["session_id", "player"], how="left")
+    return df.assign(notes=joined["notes"].to_numpy())
+
+
+# Process-wide incremental sync cache: (sheet_id, worksheet) -> (normalized, dq, sync state).
+_SYNCED: Dict[Tuple[str, str], Tuple[pd.DataFrame, DataQuality, sheets.SyncState]] = {}
+_SYNC_LOCK = threading.Lock()
+
+
+def _sync_dataset(
+    worksheet: "gspread.Worksheet", sheet_id: str, worksheet_name: str
+) -> Tuple[pd.DataFrame, DataQuality, sheets.SyncState]:
+    """
+    Fetch only appended rows and merge them into the last normalized frame.
+
+    An unchanged sheet returns the previously cached frame object itself.
+    """
+    key = (sheet_id, worksheet_name)
+    with _SYNC_LOCK:
+        cached = _SYNCED.get(key)
+    rows, state, full_reload = sheets.sync_worksheet(
+        worksheet, cached[2] if cached else None, companions=COMPANION_WORKSHEETS
+    )
+    if cached is not None and not full_reload and rows.empty:
+        # Probe found nothing new: keep the same frame so callers can skip all downstream work.
+        if state != cached[2]:
+            with _SYNC_LOCK:
+                _SYNCED[key] = (cached[0], cached[1], state)
+        return cached[0], cached[1], state
+    if full_reload or cached is None:
+        normalized, norm_dq = normalize_dataframe(rows)
+    else:
+        normalized, norm_dq = merge_normalized(cached[0], cached[1], rows)
+    norm_dq.headers = state.headers or norm_dq.headers
+    with _SYNC_LOCK:
+        _SYNCED[key] = (normalized, norm_dq, state)
+    return normalized, norm_dq, state
+
+
+def clear_sync_state() -> None:
+    """Forget incremental sync progress so the next load re-reads whole worksheets."""
+    with _SYNC_LOCK:
+        _SYNCED.clear()
+
+
+# Cold-start snapshots: key -> (revalidation thread or None, snapshot frame, snapshot quality).
+_WARM_STARTS: Dict[str, Tuple[threading.Thread | None, pd.DataFrame, DataQuality]] = {}
+_WARM_LOCK = threading.Lock()
+
+
+def _snapshot_key(sheet_id: str | None, worksheet_name: str | None) -> str:
+    # "pence" keeps snapshots written before money became integer pence from being served.
+    return io.snapshot_key("sheets", sheet_id, worksheet_name, "pence")
+
+
+def _revalidate(*load_args) -> None:
+    """Run the loader off the script thread; it refreshes the store and snapshot on success."""
+    try:
+        _FLIGHTS.do(load_args[1:], lambda: _refresh_dataset(load_args))
+    except Exception:  # pylint: disable=broad-except
+        # The snapshot keeps being served and the next foreground load retries; just leave a trace.
+        logger.exception("Background refresh of %s/%s failed", load_args[1], load_args[2])
+
+
+def _serve_warm_start(key: str, load_args: Tuple) -> Tuple[pd.DataFrame, DataQuality] | None:
+    """
+    Serve the on-disk snapshot while the first live load of this process runs in
+    the background. Returns None when there is no snapshot or revalidation has
+    finished, so callers fall through to the dataset store.
+    """
+    with _WARM_LOCK:
+        entry = _WARM_STARTS.get(key)
+        if entry is None:
+            snapshot = io.read_snapshot(key)
+            if snapshot is None:
+                _WARM_STARTS[key] = (None, pd.DataFrame(), DataQuality())
+                return None
+            frame, meta, fingerprint = snapshot
+            snapshot_dq = DataQuality(**{k: v for k, v in meta.items() if k in DataQuality.__dataclass_fields__})
+            snapshot_dq.version = f"snapshot-{fingerprint[:16]}"
+            snapshot_dq.issues.append("Showing saved snapshot while refreshing from Google Sheets.")
+            thread = threading.Thread(target=_revalidate, args=load_args, name=f"revalidate-{key}", daemon=True)
+            entry = (thread, frame, snapshot_dq)
+            _WARM_STARTS[key] = entry
+            thread.start()
+    thread, frame, snapshot_dq = entry
+    if thread is None or not thread.is_alive():
+        return None
+    return frame.copy(deep=False), DataQuality(**asdict(snapshot_dq))
+
+
+def _resolve_load_args(
+    gc: "gspread.Client | None" = None,
     sheet_id: str | None = None,
     worksheet_name: str | None = None,
-) -> Tuple[pd.DataFrame, DataQuality]:
-    """Resolve config then load from Google Sheets if configured, else fall back to sample CSV."""
+) -> Tuple:
+    """Resolve client, sheet ids and flags from arguments, session_state and secrets."""
     # Prefer client and ids stored in session_state if not explicitly provided.
     if gc is None and "gc" in st.session_state:
         gc = st.session_state.get("gc")
@@ -125,74 +371,302 @@ def load_dataset(
         worksheet_name = st.session_state.get("worksheet_name") if "worksheet_name" in st.session_state else None
     fail_on_error = str(st.secrets.get("FAIL_ON_DATA_ERROR", "0")) == "1"
     use_demo = str(st.secrets.get("USE_DEMO_DATA", "0")) == "1"
+    compact = str(st.secrets.get("COMPACT_DATA", "0")) == "1"
 
     ss_id, ws_name_cfg, sa_info = sheets.get_sheets_secrets()
     sheet_id = sheet_id or ss_id
     worksheet_name = worksheet_name or ws_name_cfg or DEFAULT_WORKSHEET_NAME
+    return gc, sheet_id, worksheet_name, fail_on_error, use_demo, bool(sa_info), compact
 
-    return _load_dataset_cached(gc, sheet_id, worksheet_name, fail_on_error, use_demo, bool(sa_info))
 
+@dataclass
+class DatasetEntry:
+    """One loaded dataset, shared read-only by every session."""
+
+    df: pd.DataFrame
+    dq: DataQuality
+    version: int = 0
+    fingerprint: str = ""
+    loaded_at: float = 0.0
+    # The frame as loaded, before compaction; a reload returning this same object means "unchanged".
+    source: pd.DataFrame | None = None
+    token: str = ""
+
+
+class DatasetStore:
+    """
+    Process-wide dataset cache that hands out views instead of pickled copies.
+
+    Each key has a version that only increases when a reload's content
+    fingerprint differs from what is stored (or after invalidation), so caches
+    of derived data can key on it.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple, DatasetEntry] = {}
+        self._versions: Dict[Tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> DatasetEntry | None:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: Tuple, df: pd.DataFrame, dq: DataQuality, source: pd.DataFrame | None = None) -> DatasetEntry:
+        fingerprint = io.content_fingerprint(df)
+        with self._lock:
+            previous = self._entries.get(key)
+            version = self._versions.get(key, 0)
+            if previous is None or previous.fingerprint != fingerprint:
+                version += 1
+                self._versions[key] = version
+            entry = DatasetEntry(
+                df=df,
+                dq=dq,
+                version=version,
+                fingerprint=fingerprint,
+                loaded_at=time.time(),
+                source=source,
+                token=f"{io.snapshot_key('dataset', *map(str, key))}-v{version}",
+            )
+            self._entries[key] = entry
+        return entry
+
+    def touch(self, key: Tuple, dq: DataQuality | None = None) -> DatasetEntry | None:
+        """Extend an entry's lifetime without re-hashing its frame (the source reported no change)."""
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is None:
+                return None
+            entry = replace(previous, dq=dq or previous.dq, loaded_at=time.time())
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, key: Tuple | None = None) -> None:
+        """Drop one entry (or all); the next load re-fetches and gets a new version."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
 
-@st.cache_data(
-    ttl=CACHE_TTL_SECONDS,
-    show_spinner=False,
-    hash_funcs={gspread.client.Client: lambda _: "gc"},
-)
-def _load_dataset_cached(
-    gc: gspread.client.Client | None,
+
+@st.cache_resource(show_spinner=False)
+def dataset_store() -> DatasetStore:
+    """The shared store; cache_resource keeps one instance per server process."""
+    return DatasetStore()
+
+
+def refresh_dataset(
+    gc: "gspread.Client | None" = None,
+    sheet_id: str | None = None,
+    worksheet_name: str | None = None,
+) -> None:
+    """
+    Force the next load of this one dataset to re-read its source.
+
+    Only this dataset's store entry and sync state are dropped. The reload gets
+    a new version token, so caches keyed on the old token simply stop being
+    used while other datasets and other users' caches stay warm.
+    """
+    load_args = _resolve_load_args(gc, sheet_id, worksheet_name)
+    with _SYNC_LOCK:
+        _SYNCED.pop((load_args[1], load_args[2]), None)
+    dataset_store().invalidate(load_args[1:])
+    sheets.clear_cache()
+
+
+# Sessions whose reruns land on an expired entry share one in-flight reload.
+_FLIGHTS = flight.SingleFlight()
+
+
+def load_stats() -> Dict[str, int]:
+    """Store hits, coalesced waits and source fetches since the process started."""
+    return _FLIGHTS.snapshot()
+
+
+def _is_fresh(entry: DatasetEntry | None) -> bool:
+    return entry is not None and time.time() - entry.loaded_at <= CACHE_TTL_SECONDS
+
+
+# Background revalidation threads, one per store key.
+_REFRESHERS: Dict[Tuple, threading.Thread] = {}
+_REFRESH_LOCK = threading.Lock()
+
+
+def _refresh_in_background(load_args: Tuple) -> None:
+    """Start a revalidation thread for this key unless one is already running."""
+    key = load_args[1:]
+    with _REFRESH_LOCK:
+        running = _REFRESHERS.get(key)
+        if running is not None and running.is_alive():
+            return
+        thread = threading.Thread(target=_revalidate, args=load_args, name="revalidate-dataset", daemon=True)
+        _REFRESHERS[key] = thread
+        thread.start()
+
+
+def load_dataset(
+    gc: "gspread.Client | None" = None,
+    sheet_id: str | None = None,
+    worksheet_name: str | None = None,
+) -> Tuple[pd.DataFrame, DataQuality]:
+    """
+    Resolve config then load from Google Sheets if configured, else fall back to sample CSV.
+
+    Results come from the shared dataset store. Once an entry is older than
+    CACHE_TTL_SECONDS it keeps being served while a background thread reloads
+    it and swaps the new version in; only the very first load of a key (with no
+    snapshot to warm-start from) waits for the source. Concurrent reloads of the
+    same key are coalesced into a single fetch. The frame returned is a shallow view of the shared one:
+    treat it as read-only (derive new frames rather than writing in place).
+    """
+    load_args = _resolve_load_args(gc, sheet_id, worksheet_name)
+    gc, sheet_id, worksheet_name, _, use_demo, has_service_account, compact = load_args
+    entry = dataset_store().get(load_args[1:])
+    if entry is None and sheet_id and (gc or has_service_account) and not use_demo:
+        warm = _serve_warm_start(_snapshot_key(sheet_id, worksheet_name), load_args)
+        if warm is not None:
+            df, dq = warm
+            return (compact_dataset(df) if compact else df), dq
+    if entry is None:
+        entry = _FLIGHTS.do(load_args[1:], lambda: _reload_if_stale(load_args))
+    else:
+        _FLIGHTS.record_hit()
+        if not _is_fresh(entry):
+            _refresh_in_background(load_args)
+    dq = DataQuality(**asdict(entry.dq))
+    dq.version = entry.token
+    # Shallow copy: under copy-on-write (pandas >= 3, see requirements) callers' writes never reach the store.
+    return entry.df.copy(deep=False), dq
+
+
+def _reload_if_stale(load_args: Tuple) -> DatasetEntry:
+    """Flight body: skip the fetch if another flight refreshed the entry meanwhile."""
+    entry = dataset_store().get(load_args[1:])
+    return entry if _is_fresh(entry) else _refresh_dataset(load_args)
+
+
+def _refresh_dataset(load_args: Tuple) -> DatasetEntry:
+    """
+    Load from the source and publish the result in the dataset store.
+
+    A failed Sheets reload does not replace data that is already being served;
+    the existing entry is re-stamped so the next attempt waits another TTL.
+    When the sheet is unchanged the entry is only re-stamped, skipping
+    compaction and fingerprinting.
+    """
+    gc, sheet_id, worksheet_name, fail_on_error, use_demo, has_service_account, compact = load_args
+    df, dq = _load_source(gc, sheet_id, worksheet_name, fail_on_error, use_demo, has_service_account)
+    store = dataset_store()
+    current = store.get(load_args[1:])
+    if current is not None and any(issue.startswith(_LOAD_FAILED) for issue in dq.issues):
+        return store.touch(load_args[1:]) or current
+    if current is not None and current.source is df:
+        return store.touch(load_args[1:], dq) or current
+    source = df
+    if compact:
+        df = _split_notes(_snapshot_key(sheet_id, worksheet_name), compact_dataset(df))
+    return store.put(load_args[1:], df, dq, source=source)
+
+
+_LOAD_FAILED = "Sheets load failed"
+
+
+# Frame last written per snapshot key, so an unchanged sheet is not re-hashed and re-written.
+_SAVED: Dict[str, pd.DataFrame] = {}
+
+
+def _save_snapshot(sheet_id: str | None, worksheet_name: str | None, df: pd.DataFrame, dq: DataQuality) -> None:
+    key = _snapshot_key(sheet_id, worksheet_name)
+    if _SAVED.get(key) is df:
+        return
+    if io.write_snapshot(key, df, asdict(dq)) is not None:
+        _SAVED[key] = df
+
+
+def _last_good_snapshot(
+    sheet_id: str | None, worksheet_name: str | None, dq: DataQuality
+) -> Tuple[pd.DataFrame, DataQuality] | None:
+    """The on-disk snapshot of the last successful Sheets load, marked as such in `dq`."""
+    snapshot = io.read_snapshot(_snapshot_key(sheet_id, worksheet_name))
+    if snapshot is None:
+        return None
+    frame, meta, _ = snapshot
+    dq.source = "snapshot"
+    dq.loaded_at = meta.get("loaded_at")
+    dq.headers = meta.get("headers") or list(frame.columns)
+    dq.warnings.update(meta.get("warnings") or {})
+    dq.issues.append("Google Sheets is unavailable; showing the last saved copy of the sheet.")
+    return frame, dq
+
+
+def _load_source(
+    gc: "gspread.Client | None",
     sheet_id: str | None,
     worksheet_name: str | None,
     fail_on_error: bool,
     use_demo: bool,
     has_service_account: bool,
 ) -> Tuple[pd.DataFrame, DataQuality]:
-    dq = DataQuality()
+    dq = DataQuality(loaded_at=time.time())
     df = pd.DataFrame()
     headers: List[str] = []
+    live_failed = False
 
     live_configured = bool(sheet_id) and has_service_account
     use_live = (bool(gc) and bool(sheet_id) or live_configured) and not use_demo
 
     if use_live and gc:
         try:
-            sheet = gc.open_by_key(sheet_id)
-            worksheet = sheet.worksheet(worksheet_name)
-            headers = worksheet.row_values(1)
-            records = worksheet.get_all_records()
-            df = pd.DataFrame(records)
-            dq.source = "sheets"
-            if df is None or df.empty:
-                dq.issues.append("Google Sheet is empty. Add rows to see data.")
+            normalized, norm_dq, state = sheets.call_sheets(
+                lambda: _sync_dataset(gc.open_by_key(sheet_id).worksheet(worksheet_name), sheet_id, worksheet_name)
+            )
         except Exception as exc:  # pylint: disable=broad-except
-            dq.issues.append(f"Sheets load failed: {type(exc).__name__}: {exc}")
+            dq.issues.append(f"{_LOAD_FAILED}: {type(exc).__name__}: {exc}")
             dq.source = "sheets"
+            live_failed = True
             if fail_on_error:
                 raise
         else:
-            normalized, norm_dq = normalize_dataframe(df)
+            dq.source = "sheets"
+            if not state.row_count:
+                dq.issues.append("Google Sheet is empty. Add rows to see data.")
             dq.issues.extend(norm_dq.issues)
             dq.warnings.update(norm_dq.warnings)
-            dq.headers = headers or norm_dq.headers
+            dq.headers = norm_dq.headers
+            _save_snapshot(sheet_id, worksheet_name, normalized, dq)
             return normalized, dq
-
-    if use_live and not df.shape[0]:
+    elif use_live:
         try:
-            df, headers = sheets.fetch_sheet(spreadsheet_id=sheet_id, worksheet_name=worksheet_name)
+            normalized, norm_dq, state = sheets.call_sheets(
+                lambda: _sync_dataset(
+                    sheets.open_worksheet(spreadsheet_id=sheet_id, worksheet_name=worksheet_name),
+                    sheet_id,
+                    worksheet_name,
+                )
+            )
             dq.source = "sheets"
-            if df is None or df.empty:
+            if not state.row_count:
                 dq.issues.append("Google Sheet is empty. Add rows to see data.")
             else:
-                normalized, norm_dq = normalize_dataframe(df)
                 dq.issues.extend(norm_dq.issues)
                 dq.warnings.update(norm_dq.warnings)
-                dq.headers = headers or norm_dq.headers
+                dq.headers = norm_dq.headers
+                _save_snapshot(sheet_id, worksheet_name, normalized, dq)
                 return normalized, dq
         except Exception as exc:  # pylint: disable=broad-except
-            dq.issues.append(f"Sheets load failed: {type(exc).__name__}: {exc}")
+            dq.issues.append(f"{_LOAD_FAILED}: {type(exc).__name__}: {exc}")
             dq.source = "sheets"
+            live_failed = True
             if fail_on_error:
                 raise
 
+    if live_failed:
+        # Prefer the last real data over demo rows while Sheets is failing.
+        fallback = _last_good_snapshot(sheet_id, worksheet_name, dq)
+        if fallback is not None:
+            return fallback
+
     if df is None or df.empty:
         try:
             df = pd.read_csv(SAMPLE_CSV_PATH)
@@ -210,34 +684,194 @@ def _load_dataset_cached(
     return normalized, dq
 
 
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False, max_entries=8)
+def load_cube(_df: pd.DataFrame, version: str) -> cube.AggregateCube:
+    """
+    Shared aggregate cube for a dataset version, so filter changes only roll it up.
+
+    Keyed on `version` (DataQuality.version) alone; the frame is not hashed and
+    the cube is returned without copying, so callers must not mutate its cells.
+    """
+    return cube.build_cube(_df)
+
+
 def available_filter_columns(df: pd.DataFrame) -> List[str]:
     """Return optional filter columns present in the dataset."""
     return [col for col in OPTIONAL_COLUMNS if col in df.columns]
 
 
-def apply_filters(df: pd.DataFrame, filters: Dict[str, List]) -> pd.DataFrame:
-    """Filter by date range, players, and optional dimensions."""
+FILTER_COLUMNS = {"players": "player", "venue": "venue", "group": "group", "season": "season"}
+
+
+@dataclass
+class FilterIndex:
+    """
+    Precomputed lookup structures for apply_filters.
+
+    Dimension columns are stored as factorized integer codes, and dates as
+    int64 day numbers in sorted order so a date range becomes a binary search.
+    `version` is the dataset version it was built for; without one it is never reused.
+    """
+
+    version: str | None = None
+    n_rows: int = 0
+    days: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    order: np.ndarray | None = None
+    codes: Dict[str, np.ndarray] = field(default_factory=dict)
+    values: Dict[str, pd.Index] = field(default_factory=dict)
+
+
+def _day_number(value) -> np.int64:
+    return np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64)
+
+
+def build_filter_index(df: pd.DataFrame, version: str | None = None) -> FilterIndex:
+    """Factorize filter dimensions and sort dates once per dataset."""
+    days = df["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    order = None
+    if len(days) > 1 and not (days[1:] >= days[:-1]).all():
+        order = np.argsort(days, kind="stable")
+        days = days[order]
+    index = FilterIndex(version=version, n_rows=len(df), days=days, order=order)
+    for col in FILTER_COLUMNS.values():
+        if col in df.columns:
+            codes, uniques = pd.factorize(df[col])
+            index.codes[col] = codes
+            index.values[col] = pd.Index(uniques)
+    for arr in [index.days, index.order, *index.codes.values()]:
+        if arr is not None:
+            arr.flags.writeable = False
+    return index
+
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False, max_entries=8)
+def load_filter_index(_df: pd.DataFrame, version: str) -> FilterIndex:
+    """Shared, read-only filter index for a dataset version (the frame is not hashed)."""
+    return build_filter_index(_df, version)
+
+
+SESSION_TABLE_COLUMNS = ["session_id", "date", "players", "pot", "imbalance", "label"]
+
+
+@dataclass
+class SessionIndex:
+    """
+    Per-session lookups built once per dataset.
+
+    `sessions` has one row per session in date order (money in pence); rows of
+    the session at `sessions` position i are `order[offsets[i]:offsets[i + 1]]`.
+    `version` is the dataset version it was built for; without one it is never reused.
+    """
+
+    version: str | None = None
+    n_rows: int = 0
+    sessions: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=SESSION_TABLE_COLUMNS))
+    order: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.intp))
+    offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.intp))
+    positions: Dict[str, int] = field(default_factory=dict)
+
+
+def build_session_index(df: pd.DataFrame, version: str | None = None) -> SessionIndex:
+    """Group row positions by session and summarise each session in one sort."""
+    if df is None or df.empty:
+        return SessionIndex(version=version)
+    codes, uniques = pd.factorize(df["session_id"].astype(str))
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(uniques))
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    days = df["date"].to_numpy()[order]
+    net = df["net"].to_numpy()[order]
+    sessions = pd.DataFrame(
+        {
+            "session_id": np.asarray(uniques, dtype=object),
+            "date": np.minimum.reduceat(days, starts),
+            "players": counts,
+            "pot": np.add.reduceat(df["buy_in"].to_numpy()[order], starts) if "buy_in" in df.columns else 0,
+            "imbalance": np.add.reduceat(net, starts),
+            "code": np.arange(len(uniques)),
+        }
+    ).sort_values(["date", "session_id"], kind="stable", ignore_index=True)
+    sessions["label"] = sessions["date"].dt.strftime("%Y-%m-%d") + " - " + sessions["session_id"]
+
+    # Re-lay the row order to follow the date-sorted session table.
+    rank = np.empty(len(uniques), dtype=np.intp)
+    rank[sessions["code"].to_numpy()] = np.arange(len(uniques))
+    order = np.argsort(rank[codes], kind="stable")
+    offsets = np.r_[0, np.cumsum(sessions["players"].to_numpy())].astype(np.intp)
+    order.flags.writeable = False
+    offsets.flags.writeable = False
+    return SessionIndex(
+        version=version,
+        n_rows=len(df),
+        sessions=sessions[SESSION_TABLE_COLUMNS],
+        order=order,
+        offsets=offsets,
+        positions={sid: i for i, sid in enumerate(sessions["session_id"])},
+    )
+
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False, max_entries=8)
+def load_session_index(_df: pd.DataFrame, version: str) -> SessionIndex:
+    """Shared, read-only session index for a dataset version (the frame is not hashed)."""
+    return build_session_index(_df, version)
+
+
+def session_rows(df: pd.DataFrame, index: SessionIndex | None, session_id: str, version: str | None) -> pd.DataFrame:
+    """
+    Rows of one session via the index, without scanning the frame.
+
+    `df` must be the unmodified dataset of `version`. An index built for another
+    version (or for none) is not trusted: the rows are found through a fresh index.
+    """
+    if index is None or index.version is None or index.version != version or index.n_rows != len(df):
+        index = build_session_index(df)
+    i = index.positions.get(str(session_id))
+    if i is None:
+        return df.iloc[0:0]
+    return df.take(index.order[index.offsets[i] : index.offsets[i + 1]])
+
+
+def apply_filters(
+    df: pd.DataFrame, filters: Dict[str, List], index: FilterIndex | None = None, version: str | None = None
+) -> pd.DataFrame:
+    """
+    Filter by date range, players, and optional dimensions.
+
+    The date range is resolved by binary search over the index's sorted days;
+    each dimension filter is a lookup of its selected codes, the masks are
+    ANDed, and the frame is materialized with a single take. `index` is only
+    used when it was built for `version`, the version of the unmodified `df`;
+    otherwise a fresh one is built.
+    """
     if df is None or df.empty or not filters:
         return df
+    if index is None or index.version is None or index.version != version or index.n_rows != len(df):
+        index = build_filter_index(df)
 
-    filtered = df.copy()
+    lo, hi = 0, index.n_rows
     date_range = filters.get("date_range")
     if date_range:
         if isinstance(date_range, (list, tuple)):
             start = date_range[0]
             end = date_range[1] if len(date_range) > 1 else None
             if start:
-                filtered = filtered[filtered["date"].dt.date >= start]
+                lo = int(np.searchsorted(index.days, _day_number(start), side="left"))
             if end:
-                filtered = filtered[filtered["date"].dt.date <= end]
-
-    players = filters.get("players") or []
-    if players:
-        filtered = filtered[filtered["player"].isin(players)]
-
-    for col in ["venue", "group", "season"]:
-        vals = filters.get(col) or []
-        if vals and col in filtered.columns:
-            filtered = filtered[filtered[col].isin(vals)]
-
-    return filtered
+                hi = int(np.searchsorted(index.days, _day_number(end), side="right"))
+    positions = np.arange(lo, max(lo, hi)) if index.order is None else index.order[lo:max(lo, hi)]
+
+    mask = None
+    for key, col in FILTER_COLUMNS.items():
+        vals = filters.get(key) or []
+        if vals and col in index.codes:
+            # Slot -1 (missing values) stays False.
+            lookup = np.zeros(len(index.values[col]) + 1, dtype=bool)
+            hits = index.values[col].get_indexer(list(vals))
+            lookup[hits[hits >= 0]] = True
+            col_mask = lookup[index.codes[col][positions]]
+            mask = col_mask if mask is None else mask & col_mask
+    if mask is not None:
+        positions = positions[mask]
+    if index.order is not None:
+        positions = np.sort(positions)
+    return df.take(positions)
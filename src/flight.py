@@ -0,0 +1,72 @@
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable
+
+
+@dataclass
+class FlightStats:
+    """Counters showing whether concurrent loads are being coalesced."""
+
+    hits: int = 0
+    waits: int = 0
+    fetches: int = 0
+    errors: int = 0
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time.
+
+    Callers arriving while a call for the same key is in flight block until it
+    finishes and receive its result (or exception) instead of starting their own.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = FlightStats()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats.fetches += 1
+            else:
+                self.stats.waits += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self.stats.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def record_hit(self) -> None:
+        """Count a request that was answered from cache without a call."""
+        with self._lock:
+            self.stats.hits += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return asdict(self.stats)
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .config import SNAPSHOT_DIR
+
+_META_KEY = b"poker_standings"
+
+
+def snapshot_key(source: str, *parts: str | None) -> str:
+    """Build a filesystem-safe snapshot name from the data source and its identifiers."""
+    raw = "|".join(str(p) for p in parts if p)
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+    return f"{re.sub(r'[^a-z0-9_]', '', source.lower())}-{digest}"
+
+
+def content_fingerprint(df: pd.DataFrame) -> str:
+    """Hash a frame's columns and values; equal data gives an equal fingerprint."""
+    hasher = hashlib.sha1("|".join(map(str, df.columns)).encode("utf-8"))
+    if not df.empty:
+        hasher.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return hasher.hexdigest()
+
+
+def _snapshot_path(key: str, directory: Path | None = None) -> Path:
+    return Path(directory or SNAPSHOT_DIR) / f"{key}.parquet"
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Stringify object columns that mix types (e.g. numericised seasons next to text)."""
+    out = df
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            if out is df:
+                out = df.copy()
+            out[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return out
+
+
+def snapshot_fingerprint(key: str, directory: Path | None = None) -> str | None:
+    """Read only the stored fingerprint of a snapshot (schema metadata, no row data)."""
+    path = _snapshot_path(key, directory)
+    try:
+        meta = pq.read_schema(path).metadata or {}
+        return json.loads(meta[_META_KEY])["fingerprint"]
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
+
+
+def write_snapshot(
+    key: str, df: pd.DataFrame, metadata: Dict[str, Any], directory: Path | None = None
+) -> str | None:
+    """
+    Persist a normalized frame plus JSON metadata as a Parquet snapshot.
+
+    Skips the write when the stored fingerprint already matches. Writes go to a
+    temp file and are swapped in with os.replace so readers never see a partial
+    file. Returns the fingerprint, or None if the snapshot could not be written.
+    """
+    fingerprint = content_fingerprint(df)
+    if snapshot_fingerprint(key, directory) == fingerprint:
+        return fingerprint
+
+    path = _snapshot_path(key, directory)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+        payload = json.dumps({"fingerprint": fingerprint, "metadata": metadata}).encode("utf-8")
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _META_KEY: payload})
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError, pa.ArrowException):
+        tmp.unlink(missing_ok=True)
+        return None
+    return fingerprint
+
+
+def read_snapshot(
+    key: str, directory: Path | None = None
+) -> Tuple[pd.DataFrame, Dict[str, Any], str] | None:
+    """Load a snapshot written by write_snapshot; returns (frame, metadata, fingerprint) or None."""
+    path = _snapshot_path(key, directory)
+    if not path.exists():
+        return None
+    try:
+        table = pq.read_table(path)
+        payload = json.loads((table.schema.metadata or {})[_META_KEY])
+        return table.to_pandas(), payload.get("metadata", {}), payload["fingerprint"]
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
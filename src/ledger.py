@@ -0,0 +1,289 @@
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from . import money
+from .config import LEDGER_BAN_MIN_PENCE, LEDGER_PATH
+from .settlement import TRANSFER_COLUMNS, BatchSettlement
+
+# entries is append-only; balances is derived from it and updated in the same transaction,
+# so "who owes whom" never needs a replay. A balance row (player_a, player_b, pence) with
+# player_a < player_b means player_a owes player_b `pence` (negative: the other way round).
+# sessions.fingerprint digests the nets a session was recorded with, so later edits are noticed;
+# sessions.settled marks history that was already paid off before the ledger (no dues posted).
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL CHECK (kind IN ('due', 'paid')),
+    session_id TEXT,
+    payer TEXT NOT NULL,
+    payee TEXT NOT NULL,
+    pence INTEGER NOT NULL CHECK (pence > 0),
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    fingerprint TEXT,
+    settled INTEGER NOT NULL DEFAULT 0,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS balances (
+    player_a TEXT NOT NULL,
+    player_b TEXT NOT NULL,
+    pence INTEGER NOT NULL,
+    PRIMARY KEY (player_a, player_b)
+);
+"""
+
+
+def _exists(path: Path | None = None) -> bool:
+    """Whether the ledger file is there; readers return empty results rather than create it."""
+    return Path(path or LEDGER_PATH).exists()
+
+
+def _connect(path: Path | None = None) -> sqlite3.Connection:
+    path = Path(path or LEDGER_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+    conn.executescript(_SCHEMA)
+    # Columns added after the first release of the ledger.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+    if "fingerprint" not in columns:
+        conn.execute("ALTER TABLE sessions ADD COLUMN fingerprint TEXT")
+    if "settled" not in columns:
+        conn.execute("ALTER TABLE sessions ADD COLUMN settled INTEGER NOT NULL DEFAULT 0")
+    return conn
+
+
+def _append(conn: sqlite3.Connection, kind: str, session_id: str | None, payer: str, payee: str, pence: int) -> None:
+    conn.execute(
+        "INSERT INTO entries (kind, session_id, payer, payee, pence, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+        (kind, session_id, payer, payee, pence, time.time()),
+    )
+    owed = pence if kind == "due" else -pence
+    a, b, delta = (payer, payee, owed) if payer < payee else (payee, payer, -owed)
+    conn.execute(
+        "INSERT INTO balances (player_a, player_b, pence) VALUES (?, ?, ?) "
+        "ON CONFLICT (player_a, player_b) DO UPDATE SET pence = pence + excluded.pence",
+        (a, b, delta),
+    )
+
+
+def _reverse_session(conn: sqlite3.Connection, session_id: str) -> None:
+    """Cancel what `session_id` added to the balances by posting the opposite dues."""
+    rows = conn.execute(
+        "SELECT payer, payee, SUM(pence) FROM entries WHERE kind = 'due' AND session_id = ? GROUP BY payer, payee",
+        (session_id,),
+    ).fetchall()
+    owed: Dict[tuple, int] = {}
+    for payer, payee, pence in rows:
+        key, sign = ((payer, payee), 1) if payer < payee else ((payee, payer), -1)
+        owed[key] = owed.get(key, 0) + sign * pence
+    for (a, b), pence in owed.items():
+        if pence > 0:
+            _append(conn, "due", session_id, b, a, pence)
+        elif pence < 0:
+            _append(conn, "due", session_id, a, b, -pence)
+
+
+def session_fingerprints(batch: BatchSettlement) -> Dict[str, str]:
+    """Digest of each balanced session's nets, keyed by session id; any change to a player's net changes it."""
+    if batch.nets.empty:
+        return {}
+    frame = batch.nets.rename("net").reset_index()
+    frame["session_id"] = frame["session_id"].astype(str)
+    frame = frame[~frame["session_id"].isin(list(batch.imbalanced))]
+    # Row hashes are summed, so the digest does not depend on row order.
+    hashes = pd.util.hash_pandas_object(frame[["player", "net"]].astype({"player": str}), index=False)
+    digests = hashes.groupby(frame["session_id"], sort=False).sum()
+    return {session_id: f"{digest:016x}" for session_id, digest in digests.items()}
+
+
+def recorded_sessions(path: Path | None = None) -> Dict[str, str | None]:
+    """
+    Session id -> fingerprint of every session whose dues are in the ledger
+    (None if recorded before fingerprints). Sessions marked settled are left out.
+    """
+    if not _exists(path):
+        return {}
+    with closing(_connect(path)) as conn:
+        return dict(conn.execute("SELECT session_id, fingerprint FROM sessions WHERE NOT settled"))
+
+
+def settled_sessions(path: Path | None = None) -> set:
+    """Sessions marked as paid off before the ledger was used; they never post dues."""
+    if not _exists(path):
+        return set()
+    with closing(_connect(path)) as conn:
+        return {row[0] for row in conn.execute("SELECT session_id FROM sessions WHERE settled")}
+
+
+def pending_sessions(
+    batch: BatchSettlement, path: Path | None = None, fingerprints: Dict[str, str] | None = None
+) -> List[str]:
+    """
+    Balanced sessions in `batch` that are not in the ledger yet or whose nets changed since they were recorded.
+
+    Pass `fingerprints` (from session_fingerprints) to reuse digests computed once per dataset version.
+    """
+    if fingerprints is None:
+        fingerprints = session_fingerprints(batch)
+    known, settled = recorded_sessions(path), settled_sessions(path)
+    return [
+        sid
+        for sid, fingerprint in fingerprints.items()
+        if sid not in settled and known.get(sid, "") != fingerprint
+    ]
+
+
+def mark_settled(
+    batch: BatchSettlement,
+    session_ids: List[str],
+    path: Path | None = None,
+    fingerprints: Dict[str, str] | None = None,
+) -> List[str]:
+    """
+    Record `session_ids` as already paid off, without posting any dues.
+
+    This is the baseline for history from before the ledger was used, so a first
+    "add to ledger" does not turn every past session into debt. Sessions whose
+    dues are already in the ledger are left as they are. Returns the ids marked.
+    """
+    if fingerprints is None:
+        fingerprints = session_fingerprints(batch)
+    marked = []
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for session_id in map(str, session_ids):
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO sessions (session_id, fingerprint, settled, recorded_at) "
+                    "VALUES (?, ?, 1, ?)",
+                    (session_id, fingerprints.get(session_id), time.time()),
+                ).rowcount
+                if inserted:
+                    marked.append(session_id)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return marked
+
+
+def record_sessions(
+    batch: BatchSettlement, path: Path | None = None, fingerprints: Dict[str, str] | None = None
+) -> List[str]:
+    """
+    Record the transfers of every new or changed balanced session in `batch` as due.
+
+    A changed session first has its earlier dues cancelled by opposite due entries,
+    then its new transfers are posted, so the ledger stays append-only. Each version
+    of a session is recorded at most once, even if two sessions of the app race.
+    Returns the session ids that were added or re-posted.
+    """
+    if fingerprints is None:
+        fingerprints = session_fingerprints(batch)
+    pending = pending_sessions(batch, path, fingerprints)
+    if not pending:
+        return []
+    by_session = batch.transfers.assign(session_id=batch.transfers["session_id"].astype(str)).groupby("session_id")
+    added = []
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for session_id in pending:
+                row = conn.execute(
+                    "SELECT fingerprint, settled FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row is not None and (row[1] or row[0] == fingerprints[session_id]):
+                    continue
+                if row is not None:
+                    _reverse_session(conn, session_id)
+                conn.execute(
+                    "INSERT INTO sessions (session_id, fingerprint, recorded_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (session_id) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                    "recorded_at = excluded.recorded_at",
+                    (session_id, fingerprints[session_id], time.time()),
+                )
+                if session_id in by_session.groups:
+                    for t in by_session.get_group(session_id).itertuples(index=False):
+                        _append(conn, "due", session_id, str(t.payer), str(t.payee), int(t.amount))
+                added.append(session_id)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return added
+
+
+def _owed(conn: sqlite3.Connection, payer: str, payee: str) -> int:
+    """Pence `payer` still owes `payee` (negative: is owed by them)."""
+    a, b, sign = (payer, payee, 1) if payer < payee else (payee, payer, -1)
+    row = conn.execute("SELECT pence FROM balances WHERE player_a = ? AND player_b = ?", (a, b)).fetchone()
+    return sign * row[0] if row else 0
+
+
+def record_payment(payer: str, payee: str, pence: int, path: Path | None = None) -> None:
+    """Record that `payer` paid `payee` `pence`; more than `payer` owes `payee` is rejected."""
+    if pence <= 0:
+        raise ValueError("Payment amount must be positive.")
+    if payer == payee:
+        raise ValueError("Payer and payee must be different players.")
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            owed = _owed(conn, payer, payee)
+            if pence > owed:
+                raise ValueError(f"{payer} only owes {payee} {money.format_pounds(max(owed, 0))}.")
+            _append(conn, "paid", None, payer, payee, pence)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def outstanding(path: Path | None = None) -> pd.DataFrame:
+    """Who still owes whom (amount in pence), one row per pair with a non-zero balance, largest first."""
+    if not _exists(path):
+        return pd.DataFrame(columns=TRANSFER_COLUMNS).astype({"amount": "int64"})
+    with closing(_connect(path)) as conn:
+        rows = conn.execute("SELECT player_a, player_b, pence FROM balances WHERE pence != 0").fetchall()
+    records = [(a, b, pence) if pence > 0 else (b, a, -pence) for a, b, pence in rows]
+    frame = pd.DataFrame(records, columns=TRANSFER_COLUMNS)
+    return frame.sort_values(["amount", "payer"], ascending=[False, True], ignore_index=True)
+
+
+def owed_by_player(path: Path | None = None) -> pd.Series:
+    """Net pence each player still owes (negative: is still owed)."""
+    debts = outstanding(path)
+    owes = debts.groupby("payer")["amount"].sum()
+    owed = debts.groupby("payee")["amount"].sum()
+    return owes.sub(owed, fill_value=0).astype("int64").rename("owes").rename_axis("player")
+
+
+def unpaid_debtors(min_pence: int = LEDGER_BAN_MIN_PENCE, path: Path | None = None) -> pd.DataFrame:
+    """Players who still owe at least `min_pence` overall, shaped like the banned_players tab."""
+    owes = owed_by_player(path)
+    owes = owes[owes >= min_pence].sort_values(ascending=False)
+    return pd.DataFrame(
+        {
+            "player_name": owes.index.astype(str),
+            "reason": [f"Owes {money.format_pounds(pence)} from settled sessions" for pence in owes],
+            "ban_type": "Temporary",
+        }
+    )
+
+
+def entries(path: Path | None = None) -> pd.DataFrame:
+    """The full ledger (amount in pence), oldest first."""
+    if not _exists(path):
+        return pd.DataFrame(columns=["kind", "session_id", "payer", "payee", "amount", "recorded_at"])
+    with closing(_connect(path)) as conn:
+        return pd.read_sql_query(
+            "SELECT kind, session_id, payer, payee, pence AS amount, recorded_at FROM entries ORDER BY id",
+            conn,
+        )
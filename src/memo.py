@@ -0,0 +1,129 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields, is_dataclass
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import flight
+from .config import MEMO_MAX_BYTES, MEMO_MAX_ENTRIES
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+def filter_key(filters: Dict[str, Any] | None) -> str:
+    """Stable digest of a filter selection; list order does not matter."""
+    canonical = {
+        name: sorted(map(str, value)) if isinstance(value, list) else value for name, value in (filters or {}).items()
+    }
+    raw = json.dumps(canonical, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def estimate_bytes(value: Any) -> int:
+    """
+    Rough in-memory size of a cached artifact (frames, arrays, dataclass instances,
+    dicts and lists of them).
+
+    Frames and series are measured deep, so the strings behind object columns count
+    towards the memory cap, not just their pointers.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, pd.Index):
+        return int(value.nbytes)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if is_dataclass(value) and not isinstance(value, type):
+        return sys.getsizeof(value) + sum(estimate_bytes(getattr(value, f.name)) for f in fields(value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class MemoCache:
+    """
+    Process-wide LRU of derived artifacts, bounded by entry count and estimated bytes.
+
+    Values are shared between sessions and must be treated as read-only.
+    Concurrent misses for the same key are computed once.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = flight.SingleFlight()
+        self._stats = MemoStats()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return self._entries[key][0]
+            self._stats.misses += 1
+        return self._flights.do(key, lambda: self._store(key, compute()))
+
+    def _store(self, key: Hashable, value: Any) -> Any:
+        size = estimate_bytes(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._entries:
+                self._stats.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._stats.bytes += size
+            while len(self._entries) > self.max_entries or self._stats.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._stats.bytes -= evicted
+                self._stats.evictions += 1
+            self._stats.entries = len(self._entries)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.bytes = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return asdict(self._stats)
+
+
+_CACHE = MemoCache(MEMO_MAX_ENTRIES, MEMO_MAX_BYTES)
+
+
+def memoize(
+    name: str, version: str, filters: Dict[str, Any] | None, compute: Callable[[], Any], *extra: Hashable
+) -> Any:
+    """
+    Compute a derived artifact at most once per (dataset version, filter state).
+
+    `name` distinguishes artifacts and `extra` any further inputs (e.g. the
+    selected player). Without a version the value is computed uncached.
+    """
+    if not version:
+        return compute()
+    return _CACHE.get_or_compute((name, version, filter_key(filters), *extra), compute)
+
+
+def stats() -> Dict[str, int]:
+    return _CACHE.snapshot()
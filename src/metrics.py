@@ -1,108 +1,173 @@
+import numpy as np
 import pandas as pd
 
 from . import schema
 
-def _win_rate_from_series(net_series: pd.Series) -> float:
-    """Compute win rate for a series of net values."""
-    wins = (net_series > 0).sum()
-    losses = (net_series < 0).sum()
-    total = wins + losses
-    return wins / total if total else 0.0
+
+STANDINGS_COLUMNS = [
+    "player",
+    "games_played",
+    "total_net",
+    "win_rate",
+    "avg_net",
+    "best_session_net",
+    "worst_session_net",
+]
+
+
+def win_rate_from_counts(wins: pd.Series, losses: pd.Series) -> pd.Series:
+    """Vectorized wins / (wins + losses); players with no decisions get 0."""
+    decisions = wins + losses
+    return (wins / decisions.where(decisions > 0)).fillna(0.0)
 
 
 def calculate_standings(df: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate standings by player."""
-    columns = [
-        "player",
-        "games_played",
-        "total_net",
-        "win_rate",
-        "avg_net",
-        "best_session_net",
-        "worst_session_net",
-    ]
+    """
+    Aggregate standings by player in a single vectorized groupby pass.
+
+    Win rate comes from summed win/loss indicators (wins / (wins + losses)),
+    so no per-group Python callback is needed.
+    """
     if df is None or df.empty:
-        return pd.DataFrame(columns=columns)
-
-    grouped = df.groupby("player", dropna=False)
-    standings = grouped.agg(
-        games_played=("session_id", "count"),
-        total_net=("net", "sum"),
-        avg_net=("net", "mean"),
-        best_session_net=("net", "max"),
-        worst_session_net=("net", "min"),
-    ).reset_index()
-
-    win_rates = grouped["net"].apply(_win_rate_from_series).reset_index(name="win_rate")
-    standings = standings.merge(win_rates, on="player", how="left")
-    standings = standings[columns].sort_values("total_net", ascending=False).reset_index(drop=True)
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+
+    net = df["net"]
+    working = pd.DataFrame(
+        {
+            "player": df["player"],
+            "session_id": df["session_id"],
+            "net": net,
+            "win": net > 0,
+            "loss": net < 0,
+        }
+    )
+    standings = (
+        working.groupby("player", dropna=False, observed=True)
+        .agg(
+            games_played=("session_id", "count"),
+            total_net=("net", "sum"),
+            avg_net=("net", "mean"),
+            best_session_net=("net", "max"),
+            worst_session_net=("net", "min"),
+            wins=("win", "sum"),
+            losses=("loss", "sum"),
+        )
+        .reset_index()
+    )
+    standings["win_rate"] = win_rate_from_counts(standings["wins"], standings["losses"])
+    standings = standings[STANDINGS_COLUMNS].sort_values("total_net", ascending=False).reset_index(drop=True)
     return standings
 
 
-def summary_kpis(df: pd.DataFrame) -> dict:
-    """High-level KPIs for the overview page."""
+def summary_kpis(df: pd.DataFrame, standings: pd.DataFrame | None = None) -> dict:
+    """
+    High-level KPIs for the overview page; money values are in pence.
+
+    Pass `standings` already computed for the same frame (e.g. a cube roll-up)
+    to avoid aggregating twice; total_net is summed from it.
+    """
     if df is None or df.empty:
         return {
             "total_sessions": 0,
-            "total_net": 0.0,
+            "total_net": 0,
             "top_winner": None,
-            "top_winner_net": 0.0,
+            "top_winner_net": 0,
             "biggest_loser": None,
-            "biggest_loser_net": 0.0,
+            "biggest_loser_net": 0,
         }
 
-    standings = calculate_standings(df)
+    if standings is None:
+        standings = calculate_standings(df)
     top_winner_row = standings.iloc[0] if not standings.empty else None
     loser_row = standings.iloc[standings["total_net"].idxmin()] if not standings.empty else None
 
     return {
         "total_sessions": int(df["session_id"].nunique()),
-        "total_net": float(df["net"].sum()),
+        "total_net": int(standings["total_net"].sum()),
         "top_winner": None if top_winner_row is None else top_winner_row["player"],
-        "top_winner_net": 0.0 if top_winner_row is None else float(top_winner_row["total_net"]),
+        "top_winner_net": 0 if top_winner_row is None else int(top_winner_row["total_net"]),
         "biggest_loser": None if loser_row is None else loser_row["player"],
-        "biggest_loser_net": 0.0 if loser_row is None else float(loser_row["total_net"]),
+        "biggest_loser_net": 0 if loser_row is None else int(loser_row["total_net"]),
     }
 
 
+STREAK_COLUMNS = ["current_streak", "longest_win_streak", "longest_loss_streak"]
+
+
+def compute_all_streaks(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Streaks for every player in one vectorized run-length-encoding pass.
+
+    Rows are ordered by player then date; a new run starts whenever the player
+    or the sign of net changes. Win = net>0, loss = net<0, neutral (0 or missing)
+    breaks a streak. current_streak is signed: positive for wins, negative for
+    losses, 0 when the last session was neutral.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["player"] + STREAK_COLUMNS)
+
+    ordered = df[["player", "date", "net"]].sort_values(["player", "date"], kind="stable")
+    players = ordered["player"].to_numpy()
+    signs = np.sign(ordered["net"].fillna(0).to_numpy(dtype=float)).astype(np.int8)
+
+    new_player = np.r_[True, players[1:] != players[:-1]]
+    new_run = new_player | np.r_[True, signs[1:] != signs[:-1]]
+    starts = np.flatnonzero(new_run)
+    runs = pd.DataFrame(
+        {
+            "player": players[starts],
+            "sign": signs[starts],
+            "length": np.diff(np.r_[starts, len(ordered)]),
+        }
+    )
+
+    last_runs = runs.drop_duplicates("player", keep="last").set_index("player")
+    streaks = pd.DataFrame(index=last_runs.index)
+    streaks["current_streak"] = last_runs["sign"].astype(int) * last_runs["length"]
+    streaks["longest_win_streak"] = runs.loc[runs["sign"] > 0].groupby("player")["length"].max()
+    streaks["longest_loss_streak"] = runs.loc[runs["sign"] < 0].groupby("player")["length"].max()
+    streaks[STREAK_COLUMNS] = streaks[STREAK_COLUMNS].fillna(0).astype(int)
+    return streaks.rename_axis("player").reset_index()
+
+
+def streak_label(current: int) -> str:
+    """Human label for a signed current streak."""
+    if current > 0:
+        return f"Win {current}"
+    if current < 0:
+        return f"Loss {abs(current)}"
+    return "Neutral"
+
+
 def compute_streaks(net_series: pd.Series) -> dict:
     """
     Calculate current streak, longest win streak, and longest loss streak.
     Win = net>0, loss = net<0, neutral = net==0 resets streak.
     """
-    longest_win = 0
-    longest_loss = 0
-    current = 0
-
-    for value in net_series:
-        if value > 0:
-            current = current + 1 if current > 0 else 1
-            longest_win = max(longest_win, current)
-        elif value < 0:
-            current = current - 1 if current < 0 else -1
-            longest_loss = min(longest_loss, current)
-        else:
-            current = 0
-
-    if current > 0:
-        current_label = f"Win {current}"
-        current_type = "win"
-    elif current < 0:
-        current_label = f"Loss {abs(current)}"
-        current_type = "loss"
+    single = pd.DataFrame({"player": "", "date": np.arange(len(net_series)), "net": list(net_series)})
+    streaks = compute_all_streaks(single)
+    if streaks.empty:
+        current, longest_win, longest_loss = 0, 0, 0
     else:
-        current_label = "Neutral"
-        current_type = "neutral"
+        current, longest_win, longest_loss = (int(v) for v in streaks.iloc[0][STREAK_COLUMNS])
 
+    current_type = "win" if current > 0 else "loss" if current < 0 else "neutral"
     return {
-        "current": {"type": current_type, "count": abs(current), "label": current_label},
-        "longest_win": int(longest_win),
-        "longest_loss": int(abs(longest_loss)),
+        "current": {"type": current_type, "count": abs(current), "label": streak_label(current)},
+        "longest_win": longest_win,
+        "longest_loss": longest_loss,
     }
 
 
+def add_streaks(standings: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """Attach current/longest streak columns from `df` to a standings table."""
+    if standings is None or standings.empty:
+        return standings
+    return standings.merge(compute_all_streaks(df), on="player", how="left")
+
+
 def player_profile(df: pd.DataFrame, player: str) -> dict:
-    """Compute per-player insights."""
+    """Compute per-player insights (money in pence; averages may be fractional)."""
     player_df = df[df["player"] == player].sort_values("date")
     if player_df.empty:
         return {
@@ -110,8 +175,8 @@ def player_profile(df: pd.DataFrame, player: str) -> dict:
             "win_rate": 0.0,
             "avg_net": 0.0,
             "median_net": 0.0,
-            "best_session_net": 0.0,
-            "worst_session_net": 0.0,
+            "best_session_net": 0,
+            "worst_session_net": 0,
             "streaks": compute_streaks(pd.Series(dtype=float)),
             "recent": pd.DataFrame(),
         }
@@ -129,8 +194,8 @@ def player_profile(df: pd.DataFrame, player: str) -> dict:
         "win_rate": float(win_rate),
         "avg_net": float(player_df["net"].mean()),
         "median_net": float(player_df["net"].median()),
-        "best_session_net": float(player_df.loc[best_idx, "net"]),
-        "worst_session_net": float(player_df.loc[worst_idx, "net"]),
+        "best_session_net": int(player_df.loc[best_idx, "net"]),
+        "worst_session_net": int(player_df.loc[worst_idx, "net"]),
         "streaks": compute_streaks(player_df["net"]),
         "recent": player_df.sort_values("date", ascending=False).head(10),
     }
@@ -145,27 +210,55 @@ def cumulative_net(df: pd.DataFrame) -> pd.DataFrame:
     return temp[["date", "player", "cumulative_net", "net"]]
 
 
+SWING_COLUMNS = ["player", "net", "date", "group", "session_id"]
+
+
+def top_swings(df: pd.DataFrame, k: int = 10) -> pd.DataFrame:
+    """
+    The k player-sessions with the largest absolute net, in tie-break order
+    (abs desc, date desc, player asc).
+
+    Works on the normalized frame: candidates are picked with np.argpartition in
+    O(n), and only those (plus any rows tied with the k-th) are sorted.
+    """
+    if df is not None and not df.empty and "net" not in df.columns:
+        df = schema.normalize_results_df(df)
+    if df is None or df.empty or not {"player", "date", "net"}.issubset(df.columns) or k <= 0:
+        return pd.DataFrame(columns=SWING_COLUMNS)
+
+    abs_net = np.abs(pd.to_numeric(df["net"], errors="coerce").to_numpy(dtype=float, na_value=np.nan))
+    valid = ~np.isnan(abs_net) & df["date"].notna().to_numpy() & df["player"].notna().to_numpy()
+    positions = np.flatnonzero(valid)
+    if len(positions) > k:
+        values = abs_net[positions]
+        threshold = values[np.argpartition(values, len(values) - k)[len(values) - k]]
+        positions = positions[values >= threshold]
+
+    columns = [col for col in SWING_COLUMNS if col in df.columns]
+    candidates = df.iloc[positions][columns]
+    # Players compare as text, also when the column is categorical (compact mode).
+    candidates = candidates.assign(_abs=abs_net[positions], _player=candidates["player"].astype(str).to_numpy())
+    ranked = candidates.sort_values(
+        by=["_abs", "date", "_player"], ascending=[False, False, True], kind="stable", ignore_index=True
+    )
+    return ranked.head(k).drop(columns=["_abs", "_player"]).reindex(columns=SWING_COLUMNS)
+
+
 def compute_biggest_swing_session(df: pd.DataFrame) -> dict:
     """
     Find the single player-session with largest absolute net.
     Returns dict with player, net, date, group, session_id, reason(optional).
     """
-    norm = schema.normalize_results_df(df)
-    required = {"player", "date", "net"}
-    if norm.empty or not required.issubset(norm.columns):
+    top = top_swings(df, k=1)
+    if top.empty:
         return {"player": None, "net": None, "date": None, "group": None, "session_id": None, "reason": "No data"}
 
-    norm["abs_net"] = norm["net"].abs()
-    # Tie-break: abs desc, date desc, player asc
-    norm = norm.sort_values(
-        by=["abs_net", "date", "player"], ascending=[False, False, True], ignore_index=True
-    )
-    top = norm.iloc[0]
+    row = top.iloc[0]
     return {
-        "player": top.get("player"),
-        "net": float(top.get("net")),
-        "date": top.get("date"),
-        "group": top.get("group") if "group" in norm.columns else None,
-        "session_id": top.get("session_id") if "session_id" in norm.columns else None,
+        "player": row["player"],
+        "net": int(row["net"]),
+        "date": row["date"],
+        "group": row["group"] if "group" in df.columns else None,
+        "session_id": row["session_id"] if "session_id" in df.columns else None,
         "reason": None,
     }
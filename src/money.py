@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+# Money is held as int64 pence from normalization onwards and only turned back into
+# pounds when rendered, so sums and balance checks are exact.
+PENCE_PER_POUND = 100
+CURRENCY_SYMBOL = "£"
+
+# Columns of normalized frames and derived tables that hold pence.
+PENCE_COLUMNS = [
+    "buy_in",
+    "cash_out",
+    "net",
+    "amount",
+    "total_net",
+    "avg_net",
+    "best_session_net",
+    "worst_session_net",
+    "cumulative_net",
+    "owes",
+]
+
+
+# Scaled amounts are snapped to this many decimal places of a penny before rounding, which
+# removes binary float noise (1.005 * 100 == 100.49999999999999) but no real sub-penny value.
+_PENCE_NOISE_DECIMALS = 6
+
+
+def _scaled_pence(values) -> np.ndarray:
+    """Pounds -> float pence with float representation noise removed."""
+    return np.round(np.asarray(values, dtype=np.float64) * PENCE_PER_POUND, _PENCE_NOISE_DECIMALS)
+
+
+def to_pence(values) -> np.ndarray:
+    """Pounds (finite numbers, no missing values) -> int64 pence, rounded half away from zero."""
+    pence = _scaled_pence(values)
+    if not np.isfinite(pence).all():
+        raise ValueError("Money amounts must be finite numbers; mask missing or infinite values first.")
+    return (np.sign(pence) * np.floor(np.abs(pence) + 0.5)).astype(np.int64)
+
+
+def sub_pence_count(values) -> int:
+    """How many pound amounts carry fractions of a penny (and so are rounded by to_pence)."""
+    pence = _scaled_pence(values)
+    return int((pence != np.trunc(pence)).sum())
+
+
+def to_pounds(pence):
+    """Pence -> pounds for display; works on scalars, arrays and Series."""
+    return pence / PENCE_PER_POUND
+
+
+def format_pounds(pence, signed: bool = False, symbol: str = CURRENCY_SYMBOL) -> str:
+    """Render pence as e.g. '£12.50', '-£3.00' or, with signed=True, '+£12.50'."""
+    pence = int(round(pence))
+    sign = "-" if pence < 0 else "+" if signed and pence > 0 else ""
+    pounds, rest = divmod(abs(pence), PENCE_PER_POUND)
+    return f"{sign}{symbol}{pounds}.{rest:02d}"
+
+
+def for_display(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of a table with its pence columns converted to pounds."""
+    if df is None or df.empty:
+        return df
+    columns = [col for col in PENCE_COLUMNS if col in df.columns]
+    return df.assign(**{col: to_pounds(df[col]) for col in columns}) if columns else df
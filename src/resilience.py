@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while the breaker is open."""
+
+
+@dataclass
+class RetryStats:
+    """Counters for call_with_retry; updated under a lock as every session thread shares one instance."""
+
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    rejected: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {f.name: getattr(self, f.name) for f in fields(self) if not f.name.startswith("_")}
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing dependency for a while.
+
+    After `failure_threshold` consecutive failed calls the breaker opens and
+    rejects calls for `reset_seconds`; then one trial call is let through
+    (half-open). Its success closes the breaker, its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial call is allowed (0 when closed or half-open)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_seconds - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._state(), "consecutive_failures": self._failures}
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def call_with_retry(
+    fn: Callable[[], Any],
+    *,
+    is_transient: Callable[[BaseException], bool],
+    retry_after: Callable[[BaseException], float | None],
+    breaker: CircuitBreaker,
+    stats: RetryStats,
+    attempts: int,
+    base: float,
+    cap: float,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Any:
+    """
+    Call `fn`, retrying transient errors with jittered backoff behind `breaker`.
+
+    Non-transient errors propagate immediately and do not count against the
+    breaker; a call that is still failing after `attempts` tries counts once.
+    A server-provided Retry-After delay is honoured when it exceeds the backoff.
+    """
+    if not breaker.allow():
+        stats.add("rejected")
+        raise CircuitOpenError(f"Calls paused after repeated failures; next attempt in {breaker.retry_in():.0f}s.")
+    stats.add("calls")
+    attempt = 0
+    while True:
+        try:
+            result = fn()
+        except Exception as exc:  # pylint: disable=broad-except
+            if not is_transient(exc):
+                # The API answered, so it is up; a 404 or 403 is not an outage.
+                breaker.record_success()
+                raise
+            attempt += 1
+            if attempt >= attempts:
+                stats.add("failures")
+                breaker.record_failure()
+                raise
+            stats.add("retries")
+            sleep(max(backoff_delay(attempt - 1, base, cap), min(cap, retry_after(exc) or 0.0)))
+        else:
+            breaker.record_success()
+            return result
@@ -1,7 +1,10 @@
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
+from . import money
+
 
 def detect_results_schema(df: pd.DataFrame) -> str:
     """Detect which schema the results DataFrame follows."""
@@ -16,7 +19,7 @@ def detect_results_schema(df: pd.DataFrame) -> str:
 def normalize_results_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize incoming results to standard columns:
-    player, date (datetime), net (float), optional group, session_id.
+    player, date (datetime), net (int64 pence), optional group, session_id.
     """
     if df is None or df.empty:
         return pd.DataFrame(columns=["player", "date", "net", "group", "session_id"])
@@ -27,15 +30,15 @@ def normalize_results_df(df: pd.DataFrame) -> pd.DataFrame:
 
     schema = detect_results_schema(working)
 
-    # Compute net if needed
+    # Money columns as finite pounds; net is derived later in pence so it is exact
     if schema == "buyin_cashout":
-        working["net"] = pd.to_numeric(working["cash_out"], errors="coerce") - pd.to_numeric(
-            working["buy_in"], errors="coerce"
-        )
+        money_cols = ["buy_in", "cash_out"]
     elif schema == "net_direct":
-        working["net"] = pd.to_numeric(working["net"], errors="coerce")
+        money_cols = ["net"]
     else:
         return pd.DataFrame(columns=["player", "date", "net", "group", "session_id"])
+    for col in money_cols:
+        working[col] = pd.to_numeric(working[col], errors="coerce").replace([np.inf, -np.inf], np.nan)
 
     # Parse dates
     working["date"] = pd.to_datetime(working["date"], errors="coerce", dayfirst=True)
@@ -45,8 +48,14 @@ def normalize_results_df(df: pd.DataFrame) -> pd.DataFrame:
         if col in working.columns:
             working[col] = working[col].astype(str).str.strip()
 
+    working = working.dropna(subset=["player", "date", *money_cols])
+    if schema == "buyin_cashout":
+        working["net"] = money.to_pence(working["cash_out"]) - money.to_pence(working["buy_in"])
+    else:
+        working["net"] = money.to_pence(working["net"])
+
     # Keep standard columns
     keep = [col for col in ["player", "date", "net", "group", "session_id"] if col in working.columns]
-    normalized = working[keep].dropna(subset=["player", "date", "net"])
+    normalized = working[keep]
 
     return normalized
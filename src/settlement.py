@@ -1,41 +1,70 @@
-from typing import Dict, List
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
 
+import numpy as np
+import pandas as pd
 
-def compute_settlement(net_by_player: Dict[str, float], tol: float = 1e-6) -> List[Dict[str, float]]:
+from . import money
+from .config import SETTLEMENT_MAX_PLAYERS, SETTLEMENT_TIME_BUDGET_SECONDS
+
+logger = logging.getLogger(__name__)
+
+MODES = ("greedy", "optimal")
+
+
+def compute_settlement(net_by_player: Dict[str, int], mode: str = "greedy") -> List[Dict[str, int]]:
     """
     Compute minimal-ish settlement transfers from per-player net results.
 
-    net_by_player: mapping of player -> net (positive = should receive, negative = should pay).
-    Returns a list of dicts: {payer, payee, amount}
+    net_by_player: mapping of player -> net in pence (positive = should receive, negative = should pay).
+    mode: "greedy" (largest debtor pays largest creditor) or "optimal" (fewest transfers,
+    see `compute_optimal_settlement`).
+    Returns a list of dicts: {payer, payee, amount} with amount in pence.
     """
-    # Filter near-zero nets
-    cleaned = {p: n for p, n in net_by_player.items() if abs(n) > tol}
-    if not cleaned:
-        return []
+    if mode not in MODES:
+        raise ValueError(f"Unknown settlement mode {mode!r}; expected one of {MODES}.")
+    if mode == "optimal":
+        return compute_optimal_settlement(net_by_player)[0]
+    return _greedy(_cleaned_nets(net_by_player))
+
 
+def _cleaned_nets(net_by_player: Dict[str, int]) -> Dict[str, int]:
+    """Check nets are integer pence that balance exactly; drop zeros. Floats (even 10.0) are rejected."""
+    cleaned = {}
+    for player, net in net_by_player.items():
+        if isinstance(net, bool) or not isinstance(net, (int, np.integer)):
+            raise ValueError(f"Net for {player} must be integer pence, got {net!r}.")
+        pence = int(net)
+        if pence:
+            cleaned[player] = pence
     total = sum(cleaned.values())
-    if abs(total) > tol:
-        raise ValueError(f"Nets do not sum to zero (imbalance {total:.4f}).")
+    if total:
+        raise ValueError(f"Nets do not sum to zero (imbalance {money.format_pounds(total)}).")
+    return cleaned
+
 
-    creditors = sorted([(p, n) for p, n in cleaned.items() if n > tol], key=lambda x: x[1], reverse=True)
-    debtors = sorted([(p, -n) for p, n in cleaned.items() if n < -tol], key=lambda x: x[1], reverse=True)
+def _greedy(cleaned: Dict[str, int]) -> List[Dict[str, int]]:
+    creditors = sorted([(p, n) for p, n in cleaned.items() if n > 0], key=lambda x: x[1], reverse=True)
+    debtors = sorted([(p, -n) for p, n in cleaned.items() if n < 0], key=lambda x: x[1], reverse=True)
 
-    transfers: List[Dict[str, float]] = []
+    transfers: List[Dict[str, int]] = []
     i = j = 0
     while i < len(debtors) and j < len(creditors):
         debtor, owe = debtors[i]
         creditor, receive = creditors[j]
         amt = min(owe, receive)
-        transfers.append({"payer": debtor, "payee": creditor, "amount": round(amt, 2)})
+        transfers.append({"payer": debtor, "payee": creditor, "amount": amt})
 
         owe -= amt
         receive -= amt
 
-        if owe <= tol:
+        if owe == 0:
             i += 1
         else:
             debtors[i] = (debtor, owe)
-        if receive <= tol:
+        if receive == 0:
             j += 1
         else:
             creditors[j] = (creditor, receive)
@@ -43,7 +72,201 @@ def compute_settlement(net_by_player: Dict[str, float], tol: float = 1e-6) -> Li
     return transfers
 
 
-def format_transfers_text(transfers: List[Dict[str, float]], currency_symbol: str = "£") -> str:
-    """Format transfers as newline-separated text like 'Alice -> Bob: £12.50'."""
-    lines = [f"{t['payer']} -> {t['payee']}: {currency_symbol}{t['amount']:.2f}" for t in transfers]
-    return "\n".join(lines)
+def compute_optimal_settlement(
+    net_by_player: Dict[str, int],
+    max_players: int = SETTLEMENT_MAX_PLAYERS,
+    time_budget: float = SETTLEMENT_TIME_BUDGET_SECONDS,
+) -> Tuple[List[Dict[str, int]], bool]:
+    """
+    Settle with the fewest possible transfers.
+
+    A group of k players whose nets sum to zero settles in k - 1 transfers, so
+    the minimum is (players - most zero-sum groups the table splits into).
+    Exactly opposite nets are paired off first; the remaining players are
+    partitioned by a search over subsets. When more than `max_players` remain
+    or the search exceeds `time_budget` seconds, it falls back to greedy
+    (keeping the opposite pairs when that is shorter).
+
+    Returns (transfers, proven_optimal).
+    """
+    cleaned = _cleaned_nets(net_by_player)
+    pairs, rest = _pair_opposites(cleaned)
+    if len(rest) > max_players:
+        logger.info("settlement: %d unpaired players exceed the budget of %d, using greedy", len(rest), max_players)
+        return _fallback(cleaned, pairs, rest), False
+    try:
+        groups = pairs + _zero_sum_groups(rest, time.perf_counter() + time_budget)
+    except TimeoutError:
+        logger.info("settlement: search over %d players exceeded %.2fs, using greedy", len(rest), time_budget)
+        return _fallback(cleaned, pairs, rest), False
+    return _settle_groups(groups, cleaned), True
+
+
+def _settle_groups(groups: List[List[str]], cleaned: Dict[str, int]) -> List[Dict[str, int]]:
+    transfers: List[Dict[str, int]] = []
+    for group in groups:
+        transfers += _greedy({p: cleaned[p] for p in group})
+    return transfers
+
+
+def _fallback(cleaned: Dict[str, int], pairs: List[List[str]], rest: Dict[str, int]) -> List[Dict[str, int]]:
+    """Greedy over everyone, or opposite pairs plus greedy over the rest, whichever is shorter."""
+    whole = _greedy(cleaned)
+    if not pairs:
+        return whole
+    paired = _settle_groups(pairs + [list(rest)], cleaned)
+    return paired if len(paired) < len(whole) else whole
+
+
+def _pair_opposites(nets: Dict[str, int]) -> Tuple[List[List[str]], Dict[str, int]]:
+    """Split off pairs with exactly opposite nets; some optimal partition always keeps such a pair as a group."""
+    waiting: Dict[int, List[str]] = {}
+    pairs: List[List[str]] = []
+    for player, amount in nets.items():
+        partners = waiting.get(-amount)
+        if partners:
+            pairs.append([partners.pop(0), player])
+        else:
+            waiting.setdefault(amount, []).append(player)
+    rest = {player: amount for amount, names in waiting.items() for player in names}
+    return pairs, rest
+
+
+def _zero_sum_groups(nets: Dict[str, int], deadline: float) -> List[List[str]]:
+    """
+    Partition players into as many zero-sum groups as possible.
+
+    best[mask] is the most zero-sum groups that the players in `mask`, taken
+    in some order, close off along the way; it is filled one subset size at a
+    time so each layer only reads the previous one. Raises TimeoutError once
+    `deadline` (a perf_counter value) has passed.
+    """
+    players = list(nets)
+    n = len(players)
+    if n == 0:
+        return []
+    values = np.array([nets[p] for p in players], dtype=np.int64)
+    size = 1 << n
+    sums = np.zeros(size, dtype=np.int64)
+    for i in range(n):
+        sums[1 << i : 2 << i] = sums[: 1 << i] + values[i]
+    closes = (sums == 0).astype(np.int16)
+
+    popcount = np.zeros(size, dtype=np.int8)
+    for i in range(n):
+        popcount[1 << i : 2 << i] = popcount[: 1 << i] + 1
+    layers = np.split(np.argsort(popcount, kind="stable"), np.cumsum(np.bincount(popcount, minlength=n + 1))[:-1])
+
+    best = np.zeros(size, dtype=np.int16)
+    for layer in layers[1:]:
+        if time.perf_counter() > deadline:
+            raise TimeoutError
+        layer_best = np.zeros(len(layer), dtype=np.int16)
+        for i in range(n):
+            has = (layer & (1 << i)) != 0
+            layer_best[has] = np.maximum(layer_best[has], best[layer[has] ^ (1 << i)])
+        best[layer] = layer_best + closes[layer]
+
+    # Walk back from the full set to recover an order; every zero running total ends a group.
+    order: List[int] = []
+    mask = size - 1
+    while mask:
+        target = best[mask] - closes[mask]
+        i = next(i for i in range(n) if mask >> i & 1 and best[mask ^ (1 << i)] == target)
+        order.append(i)
+        mask ^= 1 << i
+    groups: List[List[str]] = []
+    current: List[str] = []
+    running = 0
+    for i in reversed(order):
+        current.append(players[i])
+        running += int(values[i])
+        if running == 0:
+            groups.append(current)
+            current = []
+    return groups
+
+
+TRANSFER_COLUMNS = ["payer", "payee", "amount"]
+
+
+@dataclass
+class BatchSettlement:
+    # Transfers in pence; per-session results carry session_id and date columns as well.
+    transfers: pd.DataFrame
+    # Net per player, or per (session_id, player) for per-session results.
+    nets: pd.Series
+    # Sessions left out because their nets do not sum to zero: session_id -> imbalance in pence.
+    imbalanced: Dict[str, int] = field(default_factory=dict)
+    # Per-session results: session_id -> (start, stop) rows of `transfers`, so a session is a slice.
+    offsets: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+
+def session_nets(df: pd.DataFrame) -> pd.Series:
+    """Net per (session_id, player) in one groupby."""
+    if df is None or df.empty:
+        return pd.Series(dtype="int64", index=pd.MultiIndex.from_arrays([[], []], names=["session_id", "player"]))
+    return df.groupby(["session_id", "player"], observed=True, sort=False)["net"].sum()
+
+
+def _imbalances(nets: pd.Series) -> Dict[str, int]:
+    totals = nets.groupby(level="session_id", sort=False).sum()
+    return {str(sid): int(total) for sid, total in totals[totals != 0].items()}
+
+
+def settle_sessions(df: pd.DataFrame, mode: str = "greedy") -> BatchSettlement:
+    """
+    Settle every session in `df` separately, in one pass over the rows.
+
+    Sessions that do not balance are reported in `imbalanced` and get no transfers.
+    """
+    nets = session_nets(df)
+    if nets.empty:
+        return BatchSettlement(pd.DataFrame(columns=["session_id", "date", *TRANSFER_COLUMNS]), nets)
+    imbalanced = _imbalances(nets)
+    dates = df.groupby("session_id", observed=True, sort=False)["date"].min()
+    rows = []
+    for session_id, players in nets.groupby(level="session_id", sort=False):
+        if str(session_id) in imbalanced:
+            continue
+        by_player = players.droplevel("session_id").to_dict()
+        for transfer in compute_settlement(by_player, mode=mode):
+            rows.append({"session_id": session_id, "date": dates.get(session_id), **transfer})
+    transfers = pd.DataFrame(rows, columns=["session_id", "date", *TRANSFER_COLUMNS])
+    offsets = {}
+    if not transfers.empty:
+        transfers = transfers.sort_values(["date", "session_id"], kind="stable", ignore_index=True)
+        # Each session has one date, so its transfers are contiguous after the sort.
+        ids = transfers["session_id"].astype(str).to_numpy()
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        stops = np.r_[starts[1:], len(ids)]
+        offsets = {ids[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)}
+    return BatchSettlement(transfers, nets, imbalanced, offsets)
+
+
+def session_transfers(batch: BatchSettlement, session_id: str) -> pd.DataFrame:
+    """Transfers of one session of a settle_sessions result, as a slice rather than a scan."""
+    start, stop = batch.offsets.get(str(session_id), (0, 0))
+    return batch.transfers.iloc[start:stop]
+
+
+def settle_period(df: pd.DataFrame, mode: str = "greedy") -> BatchSettlement:
+    """
+    Net every player's balance across all sessions in `df` (e.g. a month, group or season) and settle once.
+
+    Sessions that do not balance are left out and reported in `imbalanced`.
+    """
+    nets = session_nets(df)
+    imbalanced = _imbalances(nets)
+    if imbalanced:
+        nets = nets[~nets.index.get_level_values("session_id").astype(str).isin(list(imbalanced))]
+    by_player = nets.groupby(level="player", observed=True, sort=False).sum()
+    transfers = compute_settlement(by_player.to_dict(), mode=mode)
+    return BatchSettlement(pd.DataFrame(transfers, columns=TRANSFER_COLUMNS), by_player, imbalanced)
+
+
+def format_transfers_text(transfers: List[Dict[str, int]], currency_symbol: str = money.CURRENCY_SYMBOL) -> str:
+    """Format transfers (amounts in pence) as newline-separated text like 'Alice -> Bob: £12.50'."""
+    return "\n".join(
+        f"{t['payer']} -> {t['payee']}: {money.format_pounds(t['amount'], symbol=currency_symbol)}" for t in transfers
+    )
@@ -0,0 +1,27 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Stage name -> seconds, from the most recent run of each stage in this process.
+STAGES: Dict[str, float] = {}
+# The same for the first run only, i.e. the cold start.
+COLD_START: Dict[str, float] = {}
+
+
+def record(name: str, seconds: float) -> None:
+    STAGES[name] = seconds
+    COLD_START.setdefault(name, seconds)
+    logger.info("stage %s took %.1f ms", name, seconds * 1000)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block and record it under `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
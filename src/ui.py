@@ -1,9 +1,10 @@
+import time
 import streamlit as st
-import plotly.express as px
 import pandas as pd
 from typing import Dict, List
 
-from . import sheets
+from . import data, metrics, money
+from .config import FULL_RESYNC_SECONDS
 
 
 NEON = {
@@ -385,20 +386,44 @@ def section_header(title: str, chip: str | None = None) -> None:
     )
 
 
+def format_data_age(loaded_at: float | None, now: float | None = None) -> str:
+    """Human-readable age of a dataset, e.g. 'just now' or '3 min ago'."""
+    if not loaded_at:
+        return "unknown"
+    seconds = max(0, int((now or time.time()) - loaded_at))
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{seconds // 60} min ago"
+    if seconds < 86400:
+        return f"{seconds // 3600} h ago"
+    return f"{seconds // 86400} d ago"
+
+
 def show_mode_banner(dq) -> None:
-    """Notify whether we are in demo or Sheets mode."""
-    if dq.source != "sheets":
+    """Notify whether we are in demo or Sheets mode, and how old the data is."""
+    if dq.source == "snapshot":
+        st.warning(
+            f"Google Sheets is unavailable; showing saved data from {format_data_age(dq.loaded_at)}. "
+            "It will update automatically once Sheets responds."
+        )
+    elif dq.source != "sheets":
         st.info("Running in demo mode (sample data). Add secrets to use your Google Sheet.")
     else:
         st.success("Connected to Google Sheets. Use refresh if you've added new rows.")
+        if getattr(dq, "loaded_at", None):
+            st.caption(
+                f"Data loaded {format_data_age(dq.loaded_at)}; newer rows are fetched in the background. "
+                f"Edits to names or dates in older rows can take up to {FULL_RESYNC_SECONDS // 60} minutes "
+                "to appear — use Refresh data to pick them up now."
+            )
 
 
 def render_refresh_button() -> None:
-    """Provide a refresh control that clears caches."""
+    """Provide a refresh control that reloads the current dataset."""
     with st.container():
-        if st.button("Refresh data", help="Clears cached reads and reloads the sheet", type="primary"):
-            sheets.clear_cache()
-            st.cache_data.clear()
+        if st.button("Refresh data", help="Re-reads the sheet; other cached data stays warm", type="primary"):
+            data.refresh_dataset()
             st.rerun()
 
 
@@ -439,12 +464,14 @@ def render_kpi_row(kpis: Dict) -> None:
         {
             "label": "Most profitable player (aka the bastard that took your money)",
             "value": kpis.get("top_winner") or "-",
-            "delta": None if kpis.get("top_winner") is None else f"{kpis.get('top_winner_net', 0.0):.2f}",
+            "delta": None if kpis.get("top_winner") is None else money.format_pounds(kpis.get("top_winner_net", 0)),
         },
         {
             "label": "Taking the fattest L",
             "value": kpis.get("biggest_loser") or "-",
-            "delta": None if kpis.get("biggest_loser") is None else f"{kpis.get('biggest_loser_net', 0.0):.2f}",
+            "delta": (
+                None if kpis.get("biggest_loser") is None else money.format_pounds(kpis.get("biggest_loser_net", 0))
+            ),
         },
         _build_biggest_swing_card(kpis.get("biggest_swing")),
     ]
@@ -456,9 +483,7 @@ def _build_biggest_swing_card(swing: Dict | None) -> Dict:
     if not swing or swing.get("net") is None:
         return {"label": "Biggest swing session", "value": "-", "delta": "No session results yet"}
 
-    net = swing.get("net", 0.0)
-    sign = "+" if net > 0 else ""
-    value = f"{sign}£{net:.2f}"
+    value = money.format_pounds(swing.get("net", 0), signed=True)
     date_str = (
         swing.get("date").date().isoformat()
         if swing.get("date") is not None and hasattr(swing.get("date"), "date")
@@ -525,6 +550,7 @@ def render_standings_table(standings: pd.DataFrame) -> None:
         return
 
     max_games = float(standings["games_played"].max()) if "games_played" in standings.columns else 0.0
+    show_streaks = "current_streak" in standings.columns
 
     rows_html = []
     for idx, row in standings.reset_index(drop=True).iterrows():
@@ -543,33 +569,45 @@ def render_standings_table(standings: pd.DataFrame) -> None:
         win_bar = render_xp_bar(row.get("win_rate", 0), 1, label=f"{win_rate:.0f}%")
         games = int(row.get("games_played", 0))
         games_bar = render_xp_bar(games, max_games if max_games else 1, label=f"{games} games")
+        streak_html = ""
+        if show_streaks:
+            current = int(row.get("current_streak", 0))
+            streak_color = NEON["accent_pos"] if current > 0 else NEON["accent_neg"] if current < 0 else NEON["neutral"]
+            streak_html = (
+                f"<td><span style='color:{streak_color}'>{metrics.streak_label(current)}</span>"
+                f"<br><small>Best W{int(row.get('longest_win_streak', 0))} · "
+                f"Worst L{int(row.get('longest_loss_streak', 0))}</small></td>"
+            )
         rows_html.append(
             f"<tr>"
             f"<td><span class='rank-badge {badge_class}'>{badge_text}</span></td>"
             f"<td><div class='player-cell'><span class='player-avatar'></span><strong>{row['player']}</strong></div></td>"
-            f"<td style='color:{net_color}'>{net:.2f}</td>"
+            f"<td style='color:{net_color}'>{money.format_pounds(net)}</td>"
             f"<td>{win_bar}</td>"
             f"<td>{games_bar}</td>"
+            f"{streak_html}"
             f"</tr>"
         )
 
+    streak_header = "<th>Streak</th>" if show_streaks else ""
     table_html = (
         "<div class='leaderboard-wrap'>"
         "<table class='leaderboard-table'>"
-        "<thead><tr><th>Rank</th><th>Player</th><th>Net</th><th>Win %</th><th>Games</th></tr></thead>"
+        f"<thead><tr><th>Rank</th><th>Player</th><th>Net</th><th>Win %</th><th>Games</th>{streak_header}</tr></thead>"
         f"<tbody>{''.join(rows_html)}</tbody></table>"
         "</div>"
     )
     st.markdown(f"<div class='arcade-card'>{table_html}</div>", unsafe_allow_html=True)
 
 
-def plot_cumulative_net(df: pd.DataFrame) -> None:
-    """Plot cumulative net over time by player."""
+def plot_cumulative_net(df: pd.DataFrame, cumulative: pd.DataFrame | None = None) -> None:
+    """Plot cumulative net over time by player; pass `cumulative` if already computed."""
+    import plotly.express as px
+
     if df is None or df.empty:
         st.info("Add data to see cumulative trends.")
         return
-    plot_df = df.sort_values("date").copy()
-    plot_df["cumulative_net"] = plot_df.groupby("player")["net"].cumsum()
+    plot_df = money.for_display(metrics.cumulative_net(df) if cumulative is None else cumulative)
     fig = px.line(
         plot_df,
         x="date",
@@ -586,10 +624,12 @@ def plot_cumulative_net(df: pd.DataFrame) -> None:
 
 def plot_total_net_bar(standings: pd.DataFrame) -> None:
     """Bar chart of total net by player."""
+    import plotly.express as px
+
     if standings is None or standings.empty:
         return
     fig = px.bar(
-        standings,
+        money.for_display(standings),
         x="player",
         y="total_net",
         title="Total net",
@@ -606,11 +646,14 @@ def plot_total_net_bar(standings: pd.DataFrame) -> None:
 
 def plot_player_cumulative(player_df: pd.DataFrame, player: str) -> None:
     """Plot cumulative net for a single player."""
+    import plotly.express as px
+
     if player_df.empty:
         st.info("No sessions for this player.")
         return
     temp = player_df.sort_values("date").copy()
     temp["cumulative_net"] = temp["net"].cumsum()
+    temp = money.for_display(temp)
     fig = px.line(
         temp,
         x="date",
@@ -627,9 +670,11 @@ def plot_player_cumulative(player_df: pd.DataFrame, player: str) -> None:
 
 def plot_player_sessions(player_df: pd.DataFrame, player: str) -> None:
     """Bar chart of per-session net for a single player."""
+    import plotly.express as px
+
     if player_df.empty:
         return
-    temp = player_df.sort_values("date")
+    temp = money.for_display(player_df.sort_values("date"))
     fig = px.bar(
         temp,
         x="date",
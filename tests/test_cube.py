@@ -0,0 +1,52 @@
+import datetime as dt
+
+import pandas as pd
+
+from src import cube, data, metrics
+
+
+def _make_df():
+    df = pd.DataFrame(
+        {
+            "session_id": ["s1", "s1", "s2", "s2", "s3", "s3"],
+            "date": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-05", "2024-01-05", "2024-01-10", "2024-01-10"]),
+            "player": ["Alice", "Bob", "Alice", "Bob", "Alice", "Carla"],
+            "buy_in": [50, 50, 40, 40, 40, 40],
+            "cash_out": [70, 30, 60, 20, 20, 60],
+            "group": ["Home", "Home", "Work", "Work", "Home", "Home"],
+            "venue": ["Flat", "Flat", "Pub", "Pub", "Flat", "Flat"],
+        }
+    )
+    df["net"] = df["cash_out"] - df["buy_in"]
+    return df
+
+
+def test_roll_up_matches_row_scan_for_filter_combinations():
+    df = _make_df()
+    agg = cube.build_cube(df)
+    for filters in [
+        {},
+        {"players": ["Alice", "Bob"]},
+        {"group": ["Home"]},
+        {"group": ["Work"], "venue": ["Pub"], "players": ["Bob"]},
+    ]:
+        expected = metrics.calculate_standings(data.apply_filters(df, filters))
+        pd.testing.assert_frame_equal(cube.roll_up(agg, filters), expected, check_dtype=False)
+
+
+def test_covers_only_full_date_range():
+    agg = cube.build_cube(_make_df())
+    assert cube.covers(agg, {"date_range": (dt.date(2024, 1, 1), dt.date(2024, 1, 10))})
+    assert not cube.covers(agg, {"date_range": (dt.date(2024, 1, 2), dt.date(2024, 1, 10))})
+
+
+def test_roll_up_with_no_matching_cells_is_empty():
+    agg = cube.build_cube(_make_df())
+    assert cube.roll_up(agg, {"group": ["Nobody"]}).empty
+
+
+def test_kpis_from_roll_up_match_row_scan():
+    df = _make_df()
+    standings = cube.roll_up(cube.build_cube(df), {"group": ["Home"]})
+    filtered = data.apply_filters(df, {"group": ["Home"]})
+    assert metrics.summary_kpis(filtered, standings=standings) == metrics.summary_kpis(filtered)
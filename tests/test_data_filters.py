@@ -0,0 +1,90 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from src import data
+
+
+def _frame(shuffle=False):
+    rng = np.random.default_rng(7)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "session_id": [f"s{i % 40}" for i in range(n)],
+            "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 60, n), unit="D"),
+            "player": rng.choice(["Alice", "Bob", "Carla", "Dan"], n),
+            "group": rng.choice(["Home", "Work", None], n),
+            "venue": rng.choice(["Flat", "Pub"], n),
+            "net": rng.integers(-50, 50, n),
+        }
+    )
+    if not shuffle:
+        df = df.sort_values("date", kind="stable").reset_index(drop=True)
+    return df
+
+
+def _naive(df, filters):
+    start, end = filters["date_range"]
+    mask = (df["date"].dt.date >= start) & (df["date"].dt.date <= end)
+    mask &= df["player"].isin(filters["players"])
+    if filters.get("group"):
+        mask &= df["group"].isin(filters["group"])
+    return df[mask]
+
+
+def test_indexed_filters_match_row_scan():
+    filters = {
+        "date_range": (dt.date(2024, 1, 10), dt.date(2024, 2, 5)),
+        "players": ["Alice", "Carla"],
+        "group": ["Home"],
+    }
+    for shuffle in (False, True):
+        df = _frame(shuffle)
+        index = data.build_filter_index(df, "v1")
+        pd.testing.assert_frame_equal(data.apply_filters(df, filters, index=index, version="v1"), _naive(df, filters))
+
+
+def test_filter_index_is_only_trusted_for_its_version():
+    filters = {"date_range": (dt.date(2024, 1, 10), dt.date(2024, 2, 5)), "players": ["Alice", "Carla"]}
+    df = _frame()
+    index = data.build_filter_index(df, "v1")
+    # Same length, different content: reusing the index would return the wrong rows.
+    other = _frame(shuffle=True)
+    assert len(other) == len(df)
+    for version in ("v2", None):
+        got = data.apply_filters(other, filters, index=index, version=version)
+        pd.testing.assert_frame_equal(got, _naive(other, filters))
+
+
+def test_empty_or_inverted_date_range_returns_no_rows():
+    df = _frame()
+    filters = {"date_range": (dt.date(2024, 3, 1), dt.date(2024, 1, 1)), "players": ["Alice"]}
+    assert data.apply_filters(df, filters).empty
+
+
+def test_session_index_matches_row_scan():
+    df = _frame(shuffle=True).assign(buy_in=lambda d: d["net"].abs() + 100)
+    index = data.build_session_index(df, "v1")
+    assert list(index.sessions["date"]) == sorted(index.sessions["date"])
+    assert len(index.sessions) == df["session_id"].nunique()
+    for _, row in index.sessions.iterrows():
+        expected = df[df["session_id"] == row["session_id"]]
+        rows = data.session_rows(df, index, row["session_id"], "v1")
+        pd.testing.assert_frame_equal(rows, expected)
+        assert row["players"] == len(expected)
+        assert row["pot"] == expected["buy_in"].sum()
+        assert row["imbalance"] == expected["net"].sum()
+        assert row["date"] == expected["date"].min()
+        assert row["label"] == f"{row['date'].date()} - {row['session_id']}"
+    assert data.session_rows(df, index, "missing", "v1").empty
+
+
+def test_session_index_is_only_trusted_for_its_version():
+    df = _frame(shuffle=True)
+    index = data.build_session_index(df, "v1")
+    first = df.iloc[0]["session_id"]
+    # Same length, different content: the old offsets would point at other rows.
+    other = df.iloc[::-1].reset_index(drop=True)
+    pd.testing.assert_frame_equal(data.session_rows(other, index, first, "v2"), other[other["session_id"] == first])
+    pd.testing.assert_frame_equal(data.session_rows(other, index, first, None), other[other["session_id"] == first])
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+
+from src import data
+
+
+@pytest.fixture(autouse=True)
+def _fresh_date_formats():
+    data._DATE_FORMATS.clear()
+    yield
+    data._DATE_FORMATS.clear()
+
+
+def _raw(dates):
+    n = len(dates)
+    return pd.DataFrame(
+        {
+            "session_id": ["s1"] * n,
+            "date": dates,
+            "player": [f"P{i}" for i in range(n)],
+            "buy_in": [10] * n,
+            "cash_out": ["20", " ", "5", "7"][:n],
+            "group": ["Home", "  ", None, "Work"][:n],
+        }
+    )
+
+
+def test_blank_cells_and_dayfirst_dates():
+    norm, dq = data.normalize_dataframe(_raw(["05/01/2024", "06/01/2024", "", "13/01/2024 "]))
+    # Row 2 has a blank date, row 1 a blank cash_out.
+    assert list(norm["date"].dt.day) == [5, 13]
+    assert list(norm["group"]) == ["Home", "Work"]
+    assert dq.warnings == {"invalid_dates": 1, "invalid_cash_out": 1, "dropped_missing_required": 1}
+
+
+def test_cached_date_format_reused_for_same_headers():
+    # Only month-first fits 01/13/2024, so this sheet's format is cached as month-first.
+    data.normalize_dataframe(_raw(["01/13/2024", "01/20/2024"]))
+    # A later delta whose first value is ambiguous keeps that format; inferring
+    # afresh would read it day-first as 2 March.
+    norm, _ = data.normalize_dataframe(_raw(["02/03/2024", "02/10/2024"]))
+    assert norm.loc[0, "date"] == pd.Timestamp("2024-02-03")
+
+
+def test_missing_dates_stay_missing():
+    raw = _raw([None, "2024-01-02", None])
+    raw["cash_out"] = 20
+    norm, dq = data.normalize_dataframe(raw)
+    assert list(norm["player"]) == ["P1"]
+    assert dq.warnings["invalid_dates"] == 2
+
+
+def _sessions(n=400):
+    players = [f"P{i % 12}" for i in range(n)]
+    return pd.DataFrame(
+        {
+            "session_id": [f"s{i // 6}" for i in range(n)],
+            "date": [f"{1 + (i // 6) % 28:02d}/0{1 + (i // 168)}/2024" for i in range(n)],
+            "player": players,
+            "buy_in": [20.5] * n,
+            "cash_out": [float((i * 7) % 45) + 0.25 for i in range(n)],
+            "group": ["Home" if i % 3 else "Work" for i in range(n)],
+            "notes": ["" if i % 5 else "late" for i in range(n)],
+        }
+    )
+
+
+def test_compact_mode_shrinks_frame_and_keeps_results():
+    from src import metrics
+
+    full, _ = data.normalize_dataframe(_sessions())
+    compact, _ = data.normalize_dataframe(_sessions(), compact=True)
+    assert isinstance(compact["player"].dtype, pd.CategoricalDtype)
+    assert compact["net"].dtype == "int32"
+    assert compact.memory_usage(deep=True).sum() < full.memory_usage(deep=True).sum() / 2
+
+    filters = {"players": ["P1", "P2", "P3"], "group": ["Home"]}
+    expected = metrics.calculate_standings(data.apply_filters(full, filters))
+    actual = metrics.calculate_standings(data.apply_filters(compact, filters))
+    pd.testing.assert_frame_equal(
+        actual.astype({"player": str}), expected, check_dtype=False, check_categorical=False
+    )
+    pd.testing.assert_frame_equal(metrics.compute_all_streaks(compact), metrics.compute_all_streaks(full))
+
+
+def test_money_is_exact_int64_pence():
+    raw = _sessions(6)
+    raw["buy_in"] = [0.1, 0.2, 10, 10, 10, 10]
+    raw["cash_out"] = [0.3, 1.001, 12.5, 2, 3, 4]
+    df, dq = data.normalize_dataframe(raw)
+    assert df["buy_in"].dtype == "int64" and df["net"].dtype == "int64"
+    assert df["net"].tolist() == [20, 80, 250, -800, -700, -600]
+    assert dq.warnings["rounded_to_pence"] == 1
+
+
+def test_infinite_amounts_are_invalid():
+    raw = _sessions(4)
+    raw["buy_in"] = ["inf", 10, "-inf", 10]
+    df, dq = data.normalize_dataframe(raw)
+    assert len(df) == 2
+    assert dq.warnings["invalid_buy_in"] == 2
@@ -0,0 +1,139 @@
+import threading
+
+import pandas as pd
+
+from src import data, resilience
+from src.data import DataQuality, DatasetStore
+
+
+def _frame(net):
+    return pd.DataFrame({"player": ["A", "B"], "net": net})
+
+
+def test_version_bumps_only_when_content_changes():
+    store = DatasetStore()
+    key = ("sheet", "Sessions")
+    first = store.put(key, _frame([1.0, -1.0]), DataQuality(source="sheets"))
+    same = store.put(key, _frame([1.0, -1.0]), DataQuality(source="sheets"))
+    changed = store.put(key, _frame([2.0, -2.0]), DataQuality(source="sheets"))
+
+    assert first.version == same.version == 1
+    assert changed.version == 2
+    assert same.loaded_at >= first.loaded_at
+
+
+def test_invalidate_drops_entry_and_next_put_gets_new_version():
+    store = DatasetStore()
+    key = ("sheet", "Sessions")
+    store.put(key, _frame([1.0, -1.0]), DataQuality(source="sheets"))
+    store.invalidate()
+
+    assert store.get(key) is None
+    assert store.put(key, _frame([1.0, -1.0]), DataQuality(source="sheets")).version == 2
+
+
+def test_shallow_view_shares_data_but_writes_do_not_leak():
+    store = DatasetStore()
+    entry = store.put(("k",), _frame([1.0, -1.0]), DataQuality(source="sheets"))
+    view = entry.df.copy(deep=False)
+    view.loc[0, "net"] = 99.0
+
+    assert entry.df.loc[0, "net"] == 1.0
+
+
+def _args():
+    return (None, "sheet", "Sessions", False, False, True, False)
+
+
+def test_failed_refresh_keeps_serving_previous_data(monkeypatch):
+    store = DatasetStore()
+    monkeypatch.setattr(data, "dataset_store", lambda: store)
+    good = _frame([1.0, -1.0])
+    store.put(_args()[1:], good, DataQuality(source="sheets", loaded_at=100.0))
+
+    failed = DataQuality(source="sheets", issues=[f"{data._LOAD_FAILED}: APIError: quota"])
+    monkeypatch.setattr(data, "_load_source", lambda *args: (_frame([5.0, -5.0]), failed))
+    entry = data._refresh_dataset(_args())
+
+    assert entry.df is good
+    assert entry.dq.loaded_at == 100.0
+    assert entry.version == 1
+
+
+def test_background_refresh_errors_are_logged(monkeypatch, caplog):
+    def boom(load_args):
+        raise RuntimeError("sheet gone")
+
+    monkeypatch.setattr(data, "_refresh_dataset", boom)
+    data._revalidate(*_args())
+    assert "sheet gone" in caplog.text
+
+
+def test_stale_entry_is_served_while_refreshing_in_background(monkeypatch):
+    store = DatasetStore()
+    monkeypatch.setattr(data, "dataset_store", lambda: store)
+    monkeypatch.setattr(data, "_resolve_load_args", lambda *args: _args())
+    stale = store.put(_args()[1:], _frame([1.0, -1.0]), DataQuality(source="sheets"))
+    stale.loaded_at -= data.CACHE_TTL_SECONDS + 1
+
+    release = threading.Event()
+
+    def slow_source(*args):
+        release.wait(timeout=5)
+        return _frame([2.0, -2.0]), DataQuality(source="sheets")
+
+    monkeypatch.setattr(data, "_load_source", slow_source)
+    df, _ = data.load_dataset()
+    assert df["net"].tolist() == [1.0, -1.0]
+
+    release.set()
+    data._REFRESHERS[_args()[1:]].join(timeout=5)
+    df, _ = data.load_dataset()
+    assert df["net"].tolist() == [2.0, -2.0]
+
+
+def test_failed_live_load_falls_back_to_last_snapshot(monkeypatch):
+    def outage(fn):
+        raise resilience.CircuitOpenError("paused")
+
+    saved = _frame([3.0, -3.0])
+    monkeypatch.setattr(data.sheets, "call_sheets", outage)
+    monkeypatch.setattr(data.io, "read_snapshot", lambda key: (saved, {"loaded_at": 50.0, "headers": ["player", "net"]}, "fp"))
+    df, dq = data._load_source(None, "sheet", "Sessions", False, False, True)
+
+    assert df is saved
+    assert dq.source == "snapshot"
+    assert dq.loaded_at == 50.0
+    assert dq.issues[0].startswith(data._LOAD_FAILED)
+
+
+def test_unchanged_reload_only_restamps_entry(monkeypatch):
+    store = DatasetStore()
+    monkeypatch.setattr(data, "dataset_store", lambda: store)
+    loaded = _frame([1.0, -1.0])
+    monkeypatch.setattr(data, "_load_source", lambda *args: (loaded, DataQuality(source="sheets", loaded_at=200.0)))
+    first = data._refresh_dataset(_args())
+    monkeypatch.setattr(data.io, "content_fingerprint", lambda df: (_ for _ in ()).throw(AssertionError("rehashed")))
+    again = data._refresh_dataset(_args())
+
+    assert again.df is first.df
+    assert again.version == first.version
+    assert again.loaded_at >= first.loaded_at
+
+
+def test_refresh_only_invalidates_the_affected_dataset(monkeypatch):
+    store = DatasetStore()
+    monkeypatch.setattr(data, "dataset_store", lambda: store)
+    monkeypatch.setattr(data, "_resolve_load_args", lambda *args: _args())
+    monkeypatch.setattr(data.sheets, "clear_cache", lambda: None)
+    other_key = ("other-sheet", "Sessions", False, False, True, False)
+    sessions = store.put(_args()[1:], _frame([1.0, -1.0]), DataQuality(source="sheets"))
+    other = store.put(other_key, _frame([1.0, -1.0]), DataQuality(source="sheets"))
+
+    data.refresh_dataset()
+
+    assert store.get(_args()[1:]) is None
+    assert store.get(other_key) is other
+    reloaded = store.put(_args()[1:], _frame([1.0, -1.0]), DataQuality(source="sheets"))
+    assert reloaded.token != sessions.token
+    assert other.token != sessions.token
@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from src.flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_fetch():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(timeout=5)
+        return "frame"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("sessions", slow_fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.time() + 5
+    while flights.snapshot()["waits"] < 7 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["frame"] * 8
+    assert flights.snapshot() == {"hits": 0, "waits": 7, "fetches": 1, "errors": 0}
+
+
+def test_errors_propagate_and_next_call_retries():
+    flights = SingleFlight()
+
+    def failing():
+        raise RuntimeError("quota")
+
+    with pytest.raises(RuntimeError):
+        flights.do("sessions", failing)
+    assert flights.do("sessions", lambda: "ok") == "ok"
+    assert flights.snapshot()["fetches"] == 2
+    assert flights.snapshot()["errors"] == 1
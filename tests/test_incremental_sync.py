@@ -0,0 +1,212 @@
+from dataclasses import replace
+
+import pandas as pd
+from gspread.utils import a1_to_rowcol, fill_gaps, numericise_all
+
+from src import data, sheets
+
+
+HEADERS = ["session_id", "date", "player", "buy_in", "cash_out", "group"]
+
+
+def _cells(rows, cells):
+    """Values of an A1 range like "A3:F" or "D2:D3" (or a whole tab when empty)."""
+    rows = [[str(v) for v in r] for r in rows]
+    if not cells:
+        return rows
+    if cells == "1:1":
+        return rows[:1]
+    start, _, end = cells.partition(":")
+    row, col = a1_to_rowcol(start)
+    last = a1_to_rowcol(end)[0] if any(c.isdigit() for c in end) else len(rows)
+    last_col = a1_to_rowcol(f"{end.rstrip('0123456789')}1")[1]
+    return [r[col - 1 : last_col] for r in rows[row - 1 : last]]
+
+
+class FakeWorksheet:
+    """Minimal stand-in for gspread.Worksheet backed by a list of rows."""
+
+    def __init__(self, rows):
+        self.rows = [list(r) for r in rows]
+        self.calls = []
+
+    def row_values(self, row):
+        return [str(v) for v in self.rows[row - 1]]
+
+    def get_all_records(self):
+        self.calls.append("all")
+        headers = self.rows[0]
+        return [dict(zip(headers, r)) for r in self.rows[1:]]
+
+    def get(self, range_name, pad_values=False):
+        self.calls.append(range_name)
+        return _cells(self.rows, range_name)
+
+
+def _sheet():
+    return FakeWorksheet(
+        [
+            HEADERS,
+            ["s1", "2024-01-01", "Alice", 10, 20, "Home"],
+            ["s1", "2024-01-01", "Bob", 10, 0, "Home"],
+        ]
+    )
+
+
+def test_sync_fetches_only_appended_rows():
+    ws = _sheet()
+    rows, state, full = sheets.sync_worksheet(ws)
+    assert full and state.row_count == 2 and len(rows) == 2
+
+    ws.rows.append(["s2", "2024-01-08", "Alice", 10, 5, "Home"])
+    rows, state, full = sheets.sync_worksheet(ws, state)
+    assert not full
+    # Earlier amounts are not re-read on every probe.
+    assert ws.calls[-1] == "A3:F"
+    assert list(rows["player"]) == ["Alice"]
+    assert rows.loc[0, "buy_in"] == 10
+    assert state.row_count == 3
+
+    rows, _, full = sheets.sync_worksheet(ws, state)
+    assert not full and rows.empty
+
+    # The digest extended with appended rows matches the sheet when amounts are rechecked.
+    state = replace(state, money_checked_at=0.0)
+    rows, _, full = sheets.sync_worksheet(ws, state)
+    assert not full and rows.empty
+
+
+def test_sync_falls_back_to_full_reload_when_rows_edited():
+    ws = _sheet()
+    _, state, _ = sheets.sync_worksheet(ws)
+    ws.rows[2][4] = 15
+    rows, state, full = sheets.sync_worksheet(ws, state)
+    assert full
+    assert len(rows) == 2
+
+
+def test_sync_rechecks_earlier_amounts_on_a_slower_clock():
+    ws = _sheet()
+    _, state, _ = sheets.sync_worksheet(ws)
+    ws.rows.append(["s2", "2024-01-08", "Carla", 10, 5, "Home"])
+    _, state, _ = sheets.sync_worksheet(ws, state)
+    ws.rows[1][3] = 12
+    rows, state, full = sheets.sync_worksheet(ws, state)
+    assert not full and rows.empty
+
+    # Once MONEY_RECHECK_SECONDS has passed the probe reads the amount columns and catches the edit.
+    state = replace(state, money_checked_at=state.money_checked_at - sheets.MONEY_RECHECK_SECONDS - 1)
+    rows, state, full = sheets.sync_worksheet(ws, state)
+    assert full
+    assert ws.calls[-4:] == ["A4:F", "D2:D4", "E2:E4", "A2:F"]
+    assert rows["buy_in"].tolist() == [12, 10, 10]
+
+    # An unchanged recheck keeps the incremental state and restarts its clock.
+    state = replace(state, money_checked_at=state.money_checked_at - sheets.MONEY_RECHECK_SECONDS - 1)
+    rows, checked, full = sheets.sync_worksheet(ws, state)
+    assert not full and rows.empty
+    assert ws.calls[-3:] == ["A4:F", "D2:D4", "E2:E4"]
+    assert checked.money_checked_at > state.money_checked_at
+
+
+def test_merge_normalized_matches_full_normalize():
+    raw = pd.DataFrame(
+        [
+            ["s1", "2024-01-01", "Alice", 10, 20, "Home"],
+            ["s1", "2024-01-01", "Bob", 10, 0, "Home"],
+            ["s2", "bad-date", "Alice", 10, 5, "Home"],
+            ["s1", "2024-01-01", "Bob", 10, 5, "Home"],
+            ["s3", "2024-01-09", "Carla", 10, 30, "Home"],
+        ],
+        columns=HEADERS,
+    )
+    full, full_dq = data.normalize_dataframe(raw)
+    base, base_dq = data.normalize_dataframe(raw.iloc[:2])
+    merged, merged_dq = data.merge_normalized(base, base_dq, raw.iloc[2:].reset_index(drop=True))
+    key = ["session_id", "player"]
+    pd.testing.assert_frame_equal(
+        merged.sort_values(key).reset_index(drop=True), full.sort_values(key).reset_index(drop=True)
+    )
+    assert merged_dq.warnings == full_dq.warnings
+
+
+def test_values_to_frame_matches_get_all_records():
+    rows = [["s1", "2024-01-01", "Alice", "10", "2,000.5"], ["s2", "2024-01-02", "Bob", "10"], ["s3", "", "Carla", "x", ""]]
+    headers = HEADERS[:5]
+    expected = pd.DataFrame(
+        [dict(zip(headers, numericise_all(r))) for r in fill_gaps(rows, cols=len(headers))]
+    )
+    got = sheets.values_to_frame(headers, rows)
+    pd.testing.assert_frame_equal(got, expected)
+    assert got["session_id"].tolist() == ["s1", "s2", "s3"]
+
+
+def test_full_reload_reads_values_in_one_request():
+    ws = _sheet()
+    rows, state, full = sheets.sync_worksheet(ws)
+    assert full
+    assert ws.calls == ["A2:F"]
+    assert rows["buy_in"].dtype == "int64"
+
+
+class FakeSpreadsheet:
+    id = "sheet-1"
+
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.batches = []
+
+    def values_batch_get(self, ranges):
+        self.batches.append(ranges)
+        value_ranges = []
+        for name in ranges:
+            title, _, cells = name.partition("!")
+            value_ranges.append({"range": name, "values": _cells(self.tabs[title.strip("'")], cells)})
+        return {"valueRanges": value_ranges}
+
+
+def test_companion_tabs_are_read_in_the_same_batch(monkeypatch):
+    ws = _sheet()
+    ws.title = "sessions"
+    ws.spreadsheet = FakeSpreadsheet({"sessions": ws.rows, "banned_players": [["player_name", "reason"], ["Dan", "Owes"]]})
+    sheets.clear_cache()
+
+    rows, state, _ = sheets.sync_worksheet(ws, companions=("banned_players",))
+    assert len(rows) == 2
+    assert ws.spreadsheet.batches == [["'sessions'!A2:F", "'banned_players'"]]
+    assert "A2:F" not in ws.calls
+
+    monkeypatch.setattr(sheets, "get_sheets_secrets", lambda: ("sheet-1", "sessions", {}))
+    banned, headers = sheets._read_sheet(None, "banned_players")
+    assert headers == ["player_name", "reason"]
+    assert banned["player_name"].tolist() == ["Dan"]
+
+    # A newer batch is served over whatever fetch_sheet cached earlier.
+    monkeypatch.setattr(sheets, "fetch_sheet", lambda **_: (pd.DataFrame({"player_name": ["Old"]}), ["player_name"]))
+    ws.spreadsheet.tabs["banned_players"].append(["Eve", "Cheated"])
+    sheets.sync_worksheet(ws, companions=("banned_players",))
+    banned, _ = sheets.fetch_companion("banned_players")
+    assert banned["player_name"].tolist() == ["Dan", "Eve"]
+    monkeypatch.undo()
+    sheets.clear_cache()
+
+
+def test_unchanged_sheet_costs_one_batched_probe():
+    ws = _sheet()
+    ws.title = "sessions"
+    _, state, _ = sheets.sync_worksheet(ws)
+    ws.spreadsheet = FakeSpreadsheet({"sessions": ws.rows})
+
+    rows, new_state, full = sheets.sync_worksheet(ws, state)
+    assert not full and rows.empty
+    assert new_state is state
+    assert ws.spreadsheet.batches == [["'sessions'!1:1", "'sessions'!A3:F"]]
+
+
+def test_sync_dataset_returns_cached_frame_when_unchanged():
+    ws = _sheet()
+    data.clear_sync_state()
+    first, _, _ = data._sync_dataset(ws, "sheet-1", "sessions")
+    again, _, _ = data._sync_dataset(ws, "sheet-1", "sessions")
+    assert again is first
+    data.clear_sync_state()
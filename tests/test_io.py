@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src import data, io
+
+
+def _normalized():
+    raw = pd.DataFrame(
+        {
+            "session_id": ["s1", "s1"],
+            "date": ["2024-01-01", "2024-01-01"],
+            "player": ["Alice", "Bob"],
+            "buy_in": [10, 10],
+            "cash_out": [25, 0],
+            "group": ["Home Crew", "Home Crew"],
+            "season": [2024, "Winter"],
+        }
+    )
+    return data.normalize_dataframe(raw)
+
+
+def test_snapshot_round_trip(tmp_path):
+    df, dq = _normalized()
+    key = io.snapshot_key("sheets", "sheet-id", "sessions")
+    fingerprint = io.write_snapshot(key, df, {"warnings": dq.warnings}, directory=tmp_path)
+    assert fingerprint == io.content_fingerprint(df)
+
+    restored, meta, stored = io.read_snapshot(key, directory=tmp_path)
+    assert stored == fingerprint
+    assert meta == {"warnings": dq.warnings}
+    assert list(restored["player"]) == ["Alice", "Bob"]
+    assert list(restored["net"]) == [1500, -1000]
+    assert list(restored["season"]) == ["2024", "Winter"]
+
+
+def test_snapshot_skips_rewrite_when_fingerprint_matches(tmp_path):
+    df, _ = _normalized()
+    key = io.snapshot_key("sheets", "sheet-id", "sessions")
+    io.write_snapshot(key, df, {}, directory=tmp_path)
+    path = tmp_path / f"{key}.parquet"
+    mtime = path.stat().st_mtime_ns
+    io.write_snapshot(key, df.copy(), {}, directory=tmp_path)
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_missing_snapshot_returns_none(tmp_path):
+    assert io.read_snapshot("sheets-missing", directory=tmp_path) is None
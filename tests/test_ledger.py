@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+
+from src import banned, ledger, settlement
+
+
+def _batch(rows):
+    df = pd.DataFrame(rows, columns=["session_id", "date", "player", "net"])
+    df["date"] = pd.to_datetime(df["date"])
+    return settlement.settle_sessions(df)
+
+
+def test_record_sessions_is_incremental_and_idempotent(tmp_path):
+    path = tmp_path / "ledger.sqlite3"
+    first = _batch([["S1", "2024-01-01", "A", 1000], ["S1", "2024-01-01", "B", -1000]])
+    assert ledger.record_sessions(first, path) == ["S1"]
+    assert ledger.record_sessions(first, path) == []
+
+    both = _batch(
+        [
+            ["S1", "2024-01-01", "A", 1000],
+            ["S1", "2024-01-01", "B", -1000],
+            ["S2", "2024-01-08", "A", -400],
+            ["S2", "2024-01-08", "B", 400],
+            ["S3", "2024-01-15", "A", 100],
+        ]
+    )
+    assert ledger.pending_sessions(both, path) == ["S2"]
+    assert ledger.record_sessions(both, path) == ["S2"]
+    assert ledger.outstanding(path).to_dict("records") == [{"payer": "B", "payee": "A", "amount": 600}]
+
+
+def test_edited_session_is_reversed_and_reposted(tmp_path):
+    path = tmp_path / "ledger.sqlite3"
+    assert ledger.record_sessions(_batch([["S1", "2024-01-01", "A", 1000], ["S1", "2024-01-01", "B", -1000]]), path)
+    ledger.record_payment("B", "A", 300, path)
+
+    edited = _batch([["S1", "2024-01-01", "A", -200], ["S1", "2024-01-01", "B", 200]])
+    assert ledger.pending_sessions(edited, path) == ["S1"]
+    assert ledger.record_sessions(edited, path) == ["S1"]
+    assert ledger.record_sessions(edited, path) == []
+    # B paid 300 against a debt that is now 200 the other way: A owes B 500.
+    assert ledger.outstanding(path).to_dict("records") == [{"payer": "A", "payee": "B", "amount": 500}]
+    assert ledger.entries(path)["kind"].tolist() == ["due", "paid", "due", "due"]
+
+
+def test_history_marked_settled_never_becomes_debt(tmp_path):
+    path = tmp_path / "ledger.sqlite3"
+    history = _batch(
+        [
+            ["S1", "2024-01-01", "A", 1000],
+            ["S1", "2024-01-01", "B", -1000],
+            ["S2", "2024-01-08", "A", -400],
+            ["S2", "2024-01-08", "B", 400],
+        ]
+    )
+    assert ledger.mark_settled(history, ["S1"], path) == ["S1"]
+    assert ledger.pending_sessions(history, path) == ["S2"]
+    assert ledger.record_sessions(history, path) == ["S2"]
+    assert ledger.outstanding(path).to_dict("records") == [{"payer": "A", "payee": "B", "amount": 400}]
+
+    # A later edit to settled history stays settled.
+    edited = _batch([["S1", "2024-01-01", "A", 900], ["S1", "2024-01-01", "B", -900]])
+    assert ledger.pending_sessions(edited, path) == []
+    assert ledger.record_sessions(edited, path) == []
+
+
+def test_payments_reduce_outstanding_and_feed_debtors(tmp_path):
+    path = tmp_path / "ledger.sqlite3"
+    ledger.record_sessions(_batch([["S1", "2024-01-01", "A", 1000], ["S1", "2024-01-01", "B", -1000]]), path)
+    ledger.record_payment("B", "A", 750, path)
+    assert ledger.owed_by_player(path).to_dict() == {"A": -250, "B": 250}
+    assert ledger.unpaid_debtors(min_pence=1, path=path)["player_name"].tolist() == ["B"]
+    # 250p is under the default ban threshold.
+    assert ledger.unpaid_debtors(path=path).empty
+
+    ledger.record_payment("B", "A", 250, path)
+    assert ledger.outstanding(path).empty
+    assert ledger.unpaid_debtors(min_pence=1, path=path).empty
+    assert ledger.entries(path)["kind"].tolist() == ["due", "paid", "paid"]
+
+    with pytest.raises(ValueError):
+        ledger.record_payment("A", "B", 0, path)
+
+
+def test_payment_above_the_pair_balance_is_rejected(tmp_path):
+    path = tmp_path / "ledger.sqlite3"
+    ledger.record_sessions(_batch([["S1", "2024-01-01", "A", 1000], ["S1", "2024-01-01", "B", -1000]]), path)
+    with pytest.raises(ValueError, match="only owes"):
+        ledger.record_payment("B", "A", 1001, path)
+    with pytest.raises(ValueError):
+        ledger.record_payment("A", "B", 100, path)
+    assert ledger.outstanding(path).to_dict("records") == [{"payer": "B", "payee": "A", "amount": 1000}]
+    assert ledger.entries(path)["kind"].tolist() == ["due"]
+
+
+def test_banned_list_adds_ledger_debtors_not_in_sheet():
+    sheet = pd.DataFrame({"Player_Name": ["Bob"], "reason": ["Ghosted"], "ban_type": ["Permanent"]})
+    debtors = pd.DataFrame(
+        {"player_name": ["bob", "Cara"], "reason": ["Owes £5.00", "Owes £2.00"], "ban_type": "Temporary"}
+    )
+    merged = banned.with_ledger_debtors(sheet, debtors)
+    assert merged["player_name"].tolist() == ["Bob", "Cara"]
+    assert merged["reason"].tolist() == ["Ghosted", "Owes £2.00"]
+
+
+def test_reading_the_ledger_never_creates_it(tmp_path, monkeypatch):
+    path = tmp_path / "data" / "ledger.sqlite3"
+    monkeypatch.setattr(banned, "LEDGER_PATH", path)
+    monkeypatch.setattr(ledger, "LEDGER_PATH", path)
+    assert banned.load_ledger_debtors().empty
+    batch = _batch([["S1", "2024-01-01", "A", 1000], ["S1", "2024-01-01", "B", -1000]])
+    assert ledger.pending_sessions(batch) == ["S1"]
+    assert ledger.outstanding().empty and ledger.entries().empty
+    assert not path.parent.exists()
+
+    ledger.record_sessions(batch)
+    assert banned.load_ledger_debtors()["player_name"].tolist() == ["B"]
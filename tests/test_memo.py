@@ -0,0 +1,64 @@
+import datetime as dt
+
+import pandas as pd
+
+from src import memo, settlement
+
+
+def test_filter_key_ignores_selection_order():
+    start, end = dt.date(2024, 1, 1), dt.date(2024, 2, 1)
+    a = memo.filter_key({"date_range": (start, end), "players": ["Bob", "Alice"]})
+    b = memo.filter_key({"players": ["Alice", "Bob"], "date_range": (start, end)})
+    assert a == b
+    assert a != memo.filter_key({"date_range": (start, end), "players": ["Alice"]})
+
+
+def test_cache_computes_once_and_evicts_least_recently_used():
+    cache = memo.MemoCache(max_entries=2, max_bytes=10**6)
+    calls = []
+
+    def compute(name):
+        calls.append(name)
+        return name
+
+    cache.get_or_compute("a", lambda: compute("a"))
+    cache.get_or_compute("b", lambda: compute("b"))
+    cache.get_or_compute("a", lambda: compute("a"))
+    cache.get_or_compute("c", lambda: compute("c"))
+    cache.get_or_compute("a", lambda: compute("a"))
+    cache.get_or_compute("b", lambda: compute("b"))
+
+    assert calls == ["a", "b", "c", "b"]
+    assert cache.snapshot()["evictions"] == 2
+
+
+def test_estimate_counts_strings_in_object_columns():
+    names = pd.DataFrame({"player": pd.Series([f"Player {i:04d}" for i in range(1000)], dtype=object)})
+    assert memo.estimate_bytes(names) > names.memory_usage(index=True, deep=False).sum() + 40 * 1000
+
+
+def test_estimate_sizes_batch_settlements_by_their_frames():
+    rows = 5000
+    df = pd.DataFrame(
+        {
+            "session_id": [f"S{i // 5}" for i in range(rows)],
+            "date": pd.Timestamp("2024-01-01"),
+            "player": [f"P{i % 5}" for i in range(rows)],
+            "net": [(-400, -100, 0, 200, 300)[i % 5] for i in range(rows)],
+        }
+    )
+    batch = settlement.settle_sessions(df)
+    frames = batch.transfers.memory_usage(index=True, deep=True).sum() + batch.nets.memory_usage(index=True, deep=True)
+    assert frames / 10 < memo.estimate_bytes(batch) < frames * 10
+
+
+def test_cache_respects_memory_cap():
+    frame = pd.DataFrame({"net": range(1000)})
+    size = memo.estimate_bytes(frame)
+    cache = memo.MemoCache(max_entries=100, max_bytes=int(size * 1.5))
+    cache.get_or_compute("first", lambda: frame)
+    cache.get_or_compute("second", lambda: frame.copy())
+
+    stats = cache.snapshot()
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= size * 1.5
@@ -42,10 +42,75 @@ def test_win_rate_logic():
     assert bob_rate == 0.5
 
 
+def test_win_rate_zero_when_only_break_even_sessions():
+    df = _make_df()
+    extra = pd.DataFrame(
+        {"session_id": ["s4"], "date": pd.to_datetime(["2024-01-12"]), "player": ["Carla"], "buy_in": [30], "cash_out": [30]}
+    )
+    extra["net"] = 0
+    standings = metrics.calculate_standings(pd.concat([df, extra], ignore_index=True))
+    carla = standings.loc[standings["player"] == "Carla"].iloc[0]
+    assert carla["win_rate"] == 0.0
+    assert carla["games_played"] == 1
+
+
+def test_summary_kpis_reuses_standings():
+    df = _make_df()
+    standings = metrics.calculate_standings(df)
+    kpis = metrics.summary_kpis(df, standings=standings)
+    assert kpis == metrics.summary_kpis(df)
+    assert kpis["top_winner"] == "Alice"
+    assert kpis["biggest_loser"] == "Bob"
+
+
 def test_streak_calculation():
     df = _make_df()
     alice_df = df[df["player"] == "Alice"]
     streaks = metrics.compute_streaks(alice_df["net"])
     assert streaks["longest_win"] == 2
     assert streaks["longest_loss"] == 1
-    assert streaks["current"]["label"].startswith("Loss")
\ No newline at end of file
+    assert streaks["current"]["label"].startswith("Loss")
+
+
+def test_all_player_streaks_match_single_player_loop():
+    df = pd.DataFrame(
+        {
+            "player": ["A", "B", "A", "B", "A", "B", "A", "B"],
+            "date": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03", "2024-01-03", "2024-01-04", "2024-01-04"]),
+            "net": [5, -1, 3, -2, 0, -4, 2, 1],
+        }
+    )
+    streaks = metrics.compute_all_streaks(df).set_index("player")
+    assert streaks.loc["A"].tolist() == [1, 2, 0]
+    assert streaks.loc["B"].tolist() == [1, 1, 3]
+    for player in ["A", "B"]:
+        single = metrics.compute_streaks(df.loc[df["player"] == player, "net"])
+        assert single["longest_win"] == streaks.loc[player, "longest_win_streak"]
+        assert single["longest_loss"] == streaks.loc[player, "longest_loss_streak"]
+
+
+def test_add_streaks_keeps_standings_order():
+    df = _make_df()
+    standings = metrics.add_streaks(metrics.calculate_standings(df), df)
+    assert list(standings["player"]) == ["Alice", "Bob"]
+    assert standings.loc[0, "current_streak"] == -1
+    assert standings.loc[1, "current_streak"] == 1
+
+
+def test_top_swings_tie_break_and_biggest_swing():
+    df = pd.DataFrame(
+        {
+            "session_id": ["s1", "s1", "s2", "s2", "s3"],
+            "date": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-08", "2024-01-08", "2024-01-15"]),
+            "player": ["Bob", "Alice", "Carla", "Alice", "Dan"],
+            "net": [-40.0, 40.0, 40.0, 5.0, -10.0],
+            "group": ["Home"] * 5,
+        }
+    )
+    top = metrics.top_swings(df, k=3)
+    assert top["player"].tolist() == ["Carla", "Alice", "Bob"]
+    assert top["net"].tolist() == [40.0, 40.0, -40.0]
+
+    swing = metrics.compute_biggest_swing_session(df)
+    assert (swing["player"], swing["session_id"], swing["net"]) == ("Carla", "s2", 40.0)
+    assert metrics.top_swings(df.iloc[0:0]).empty
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from src import money, schema
+
+
+def test_to_pence_rounds_half_away_from_zero():
+    assert money.to_pence([12.5, 0.1 + 0.2, -0.125, 0.125]).tolist() == [1250, 30, -13, 13]
+    assert money.sub_pence_count([1.001, 2.5, 0.1 + 0.2]) == 1
+
+
+def test_to_pence_rounds_decimal_halves_stored_just_below():
+    # 1.005 and 2.675 are stored as 1.00499999... and 2.67499999... in binary floats.
+    assert money.to_pence([1.005, 2.675, -1.005, 0.145]).tolist() == [101, 268, -101, 15]
+    assert money.to_pence([1.0049]).tolist() == [100]
+    assert money.sub_pence_count([1.005, 2.675, 1.15]) == 2
+
+
+def test_format_and_display_convert_only_at_render():
+    assert money.format_pounds(1250) == "£12.50"
+    assert money.format_pounds(-5) == "-£0.05"
+    assert money.format_pounds(300, signed=True) == "+£3.00"
+    shown = money.for_display(pd.DataFrame({"player": ["A"], "net": [1250], "games_played": [3]}))
+    assert shown.to_dict("records") == [{"player": "A", "net": 12.5, "games_played": 3}]
+
+
+def test_to_pence_rejects_non_finite_amounts():
+    with pytest.raises(ValueError):
+        money.to_pence([1.0, float("inf")])
+
+
+def test_results_schema_subtracts_in_pence():
+    raw = pd.DataFrame(
+        {
+            "player": ["A", "B", "C"],
+            "date": ["2024-01-01"] * 3,
+            "buy_in": [0.1, "inf", 0.3],
+            "cash_out": [0.3, 1, 0.1 + 0.2],
+        }
+    )
+    out = schema.normalize_results_df(raw)
+    assert out["player"].tolist() == ["A", "C"]
+    assert out["net"].tolist() == [20, 0]
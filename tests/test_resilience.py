@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from src import resilience
+
+
+class Transient(Exception):
+    pass
+
+
+def _call(fn, breaker, stats, sleeps):
+    return resilience.call_with_retry(
+        fn,
+        is_transient=lambda exc: isinstance(exc, Transient),
+        retry_after=lambda exc: None,
+        breaker=breaker,
+        stats=stats,
+        attempts=3,
+        base=0.5,
+        cap=8.0,
+        sleep=sleeps.append,
+    )
+
+
+def test_transient_errors_are_retried_with_bounded_backoff():
+    breaker, stats, sleeps = resilience.CircuitBreaker(3, 60), resilience.RetryStats(), []
+    outcomes = iter([Transient(), Transient(), "rows"])
+
+    def flaky():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert _call(flaky, breaker, stats, sleeps) == "rows"
+    assert stats.retries == 2
+    assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+    assert breaker.state == "closed"
+
+
+def test_non_transient_errors_are_not_retried():
+    breaker, stats, sleeps = resilience.CircuitBreaker(3, 60), resilience.RetryStats(), []
+
+    def missing():
+        raise KeyError("worksheet")
+
+    with pytest.raises(KeyError):
+        _call(missing, breaker, stats, sleeps)
+    assert sleeps == [] and stats.failures == 0
+
+
+def test_breaker_opens_then_half_opens_after_reset():
+    now = [0.0]
+    breaker = resilience.CircuitBreaker(2, 60, clock=lambda: now[0])
+    stats, sleeps = resilience.RetryStats(), []
+
+    def down():
+        raise Transient()
+
+    for _ in range(2):
+        with pytest.raises(Transient):
+            _call(down, breaker, stats, sleeps)
+    assert breaker.state == "open"
+    with pytest.raises(resilience.CircuitOpenError):
+        _call(lambda: "rows", breaker, stats, sleeps)
+    assert stats.rejected == 1
+
+    now[0] = 61.0
+    assert breaker.state == "half_open"
+    assert _call(lambda: "rows", breaker, stats, sleeps) == "rows"
+    assert breaker.state == "closed"
+
+
+def test_retry_stats_count_every_thread():
+    stats = resilience.RetryStats()
+    threads = [threading.Thread(target=lambda: [stats.add("calls") for _ in range(1000)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert stats.snapshot() == {"calls": 8000, "retries": 0, "failures": 0, "rejected": 0}
@@ -1,6 +1,7 @@
+import pandas as pd
 import pytest
 
-from src import settlement
+from src import data, settlement
 
 
 def test_two_player_settlement():
@@ -22,4 +23,101 @@ def test_multi_player_settlement():
 def test_imbalance_raises():
     nets = {"A": 5, "B": -4}
     with pytest.raises(ValueError):
-        settlement.compute_settlement(nets)
\ No newline at end of file
+        settlement.compute_settlement(nets)
+
+
+def test_balance_check_is_exact_in_pence():
+    # 0.1 + 0.2 - 0.3 is not zero in float pounds; normalized to pence it is.
+    assert 0.1 + 0.2 - 0.3 != 0
+    raw = pd.DataFrame(
+        {
+            "session_id": ["S1"] * 3,
+            "date": ["2024-01-01"] * 3,
+            "player": ["A", "B", "C"],
+            "buy_in": [0.0, 0.0, 0.3],
+            "cash_out": [0.1, 0.2, 0.0],
+            "group": ["Home"] * 3,
+        }
+    )
+    df, _ = data.normalize_dataframe(raw)
+    nets = df.set_index("player")["net"].to_dict()
+    assert nets == {"A": 10, "B": 20, "C": -30}
+    assert settlement.format_transfers_text(settlement.compute_settlement(nets)) == "C -> B: £0.20\nC -> A: £0.10"
+    with pytest.raises(ValueError):
+        settlement.compute_settlement({"A": 10.5, "B": -10.5})
+    with pytest.raises(ValueError):
+        settlement.compute_settlement({"A": 10.0, "B": -10.0})
+
+
+def _balances(transfers):
+    balances = {}
+    for t in transfers:
+        balances[t["payer"]] = balances.get(t["payer"], 0) - t["amount"]
+        balances[t["payee"]] = balances.get(t["payee"], 0) + t["amount"]
+    return balances
+
+
+def test_optimal_settlement_uses_zero_sum_subgroups():
+    # {A, C, E} and {B, D, F} each net to zero: 2 + 2 transfers, where greedy needs 5.
+    nets = {"A": -7, "B": -9, "C": 5, "D": -6, "E": 2, "F": 15}
+    greedy = settlement.compute_settlement(nets)
+    transfers, optimal = settlement.compute_optimal_settlement(nets)
+    assert len(greedy) == 5
+    assert optimal and len(transfers) == 4
+    assert _balances(transfers) == nets
+
+
+def test_optimal_settlement_pairs_opposite_nets():
+    nets = {"A": 6, "B": 4, "C": -5, "D": -5, "E": 3, "F": -3}
+    transfers = settlement.compute_settlement(nets, mode="optimal")
+    assert len(transfers) == 4
+    assert _balances(transfers) == nets
+
+
+def test_optimal_settlement_falls_back_to_greedy_over_budget():
+    nets = {"A": 7, "B": 5, "C": -7, "D": -3, "E": -2}
+    transfers, optimal = settlement.compute_optimal_settlement(nets, max_players=2)
+    assert not optimal
+    assert transfers == settlement.compute_settlement(nets)
+
+    transfers, optimal = settlement.compute_optimal_settlement({"A": 3, "B": 2, "C": -4, "D": -1}, time_budget=-1)
+    assert not optimal
+    assert len(transfers) == 3
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        settlement.compute_settlement({"A": 1, "B": -1}, mode="fastest")
+
+
+def _sessions_df():
+    return pd.DataFrame(
+        {
+            "session_id": ["S1"] * 3 + ["S2"] * 3 + ["S3"] * 2,
+            "date": pd.to_datetime(["2024-01-01"] * 3 + ["2024-01-08"] * 3 + ["2024-01-15"] * 2),
+            "player": ["A", "B", "C", "A", "B", "C", "A", "B"],
+            "net": [1000, -500, -500, -600, 500, 100, 300, -200],
+        }
+    )
+
+
+def test_settle_sessions_settles_each_session_and_flags_imbalance():
+    batch = settlement.settle_sessions(_sessions_df())
+    assert batch.imbalanced == {"S3": 100}
+    assert list(batch.transfers["session_id"].unique()) == ["S1", "S2"]
+    s1 = batch.transfers[batch.transfers["session_id"] == "S1"]
+    assert _balances(s1.to_dict("records")) == {"A": 1000, "B": -500, "C": -500}
+    assert len(batch.transfers) == 4
+    for session_id in ["S1", "S2"]:
+        pd.testing.assert_frame_equal(
+            settlement.session_transfers(batch, session_id),
+            batch.transfers[batch.transfers["session_id"] == session_id],
+        )
+    assert settlement.session_transfers(batch, "S3").empty
+
+
+def test_settle_period_nets_across_sessions():
+    period = settlement.settle_period(_sessions_df())
+    assert period.imbalanced == {"S3": 100}
+    assert period.nets.to_dict() == {"A": 400, "B": 0, "C": -400}
+    assert period.transfers.to_dict("records") == [{"payer": "C", "payee": "A", "amount": 400}]